@@ -23,6 +23,7 @@
 import asyncio
 import json
 import os
+from typing import Optional
 
 import aiofiles
 import aiohttp
@@ -47,7 +48,7 @@ class ModuleClient:
         self.port = port
         self.key = key
 
-    async def call(self, fn, target_key, params=None, file=None, timeout=16):
+    async def call(self, fn, target_key, params=None, file=None, timeout=16, session: Optional[ClientSession] = None):
         if params is None:
             params = {}
 
@@ -76,34 +77,42 @@ class ModuleClient:
                 return await _store_streaming_response(response, chunk_path)
             else:
                 raise Exception(f"Unknown content type: {content_type}")
-        try:
-            async with ClientSession(timeout=aiohttp.ClientTimeout(connect=5, sock_connect=5, total=timeout)) as session:
-                if file:
-                    file_size = os.path.getsize(file["chunk"])
-                    file_hash = await calculate_hash(file["chunk"])
-                    _, headers = create_request_data(self.key, target_key, {"file_hash": file_hash, "file_size_bytes": file_size}, content_type="application/octet-stream")
-                    headers["X-File-Size"] = str(file_size)
-                    headers["X-File-Hash"] = file_hash
-                    headers["Folder"] = file['folder']
-                    headers["Target-Key"] = target_key
-
-                    async with aiofiles.open(file["chunk"], 'rb') as f:
-                        multipartWriter = aiohttp.MultipartWriter("form-data")
-                        part = multipartWriter.append(f)
-                        part.set_content_disposition('form-data', name='chunk', filename='file')
-                        headers["Content-Type"] = f"multipart/form-data; boundary={multipartWriter.boundary}"
-                        async with session.post(url, data=multipartWriter, headers=headers, ssl=False) as response:
-                            return await _get_body(response)
+
+        async def _send(session: ClientSession):
+            if file:
+                file_size = os.path.getsize(file["chunk"])
+                file_hash = await calculate_hash(file["chunk"])
+                _, headers = create_request_data(self.key, target_key, {"file_hash": file_hash, "file_size_bytes": file_size}, content_type="application/octet-stream")
+                headers["X-File-Size"] = str(file_size)
+                headers["X-File-Hash"] = file_hash
+                headers["Folder"] = file['folder']
+                headers["Target-Key"] = target_key
+
+                async with aiofiles.open(file["chunk"], 'rb') as f:
+                    multipartWriter = aiohttp.MultipartWriter("form-data")
+                    part = multipartWriter.append(f)
+                    part.set_content_disposition('form-data', name='chunk', filename='file')
+                    headers["Content-Type"] = f"multipart/form-data; boundary={multipartWriter.boundary}"
+                    async with session.post(url, data=multipartWriter, headers=headers, ssl=False, timeout=client_timeout) as response:
+                        return await _get_body(response)
+            else:
+                chunk_index = params.pop("chunk_index", "")
+                user_path = params.pop("user_path", "")
+                serialized_data, headers = create_request_data(self.key, target_key, params)
+                if fn == "remove":
+                    async with session.delete(url, json=json.loads(serialized_data), headers=headers, ssl=False, timeout=client_timeout) as response:
+                        return await _get_body(response)
                 else:
-                    chunk_index = params.pop("chunk_index", "")
-                    user_path = params.pop("user_path", "")
-                    serialized_data, headers = create_request_data(self.key, target_key, params)
-                    if fn == "remove":
-                        async with session.delete(url, json=json.loads(serialized_data), headers=headers, ssl=False) as response:
-                            return await _get_body(response)
-                    else:
-                        async with session.post(url, json=json.loads(serialized_data), headers=headers, ssl=False) as response:
-                            return await _get_body(response, chunk_index, user_path)
+                    async with session.post(url, json=json.loads(serialized_data), headers=headers, ssl=False, timeout=client_timeout) as response:
+                        return await _get_body(response, chunk_index, user_path)
+
+        client_timeout = aiohttp.ClientTimeout(connect=5, sock_connect=5, total=timeout)
+        try:
+            if session is None:
+                async with ClientSession(timeout=client_timeout) as own_session:
+                    return await _send(own_session)
+
+            return await _send(session)
         except asyncio.TimeoutError as e:
             raise Exception(f"The call took longer than the timeout of {timeout} second(s)").with_traceback(e.__traceback__)
         except aiohttp.ClientError as e:
@@ -21,13 +21,17 @@
 #  SOFTWARE.
 
 import asyncio
+import os
+import queue
+import random
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import wraps
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
-from communex._common import get_node_url, transform_stake_dmap
+from aiohttp import ClientSession
+from communex._common import ComxSettings, transform_stake_dmap
 from communex.client import CommuneClient
 from communex.key import check_ss58_address
-from communex.module._util import retry
 from substrateinterface import Keypair
 
 from communex.types import Ss58Address
@@ -45,6 +49,26 @@ EXTENDED_PING_TIMEOUT = 60
 CALL_TIMEOUT = 10
 RETRIES = 5
 TIMEOUT = 30
+MAX_NODE_PROBES = 8
+NODE_PROBE_HEDGE_SECONDS = 1
+
+_node_probe_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _reset_node_probe_executor():
+    global _node_probe_executor
+    _node_probe_executor = None
+
+
+# Worker threads do not survive a fork, the child process creates its own executor when it needs it
+os.register_at_fork(after_in_child=_reset_node_probe_executor)
+
+
+def _get_node_probe_executor() -> ThreadPoolExecutor:
+    global _node_probe_executor
+    if _node_probe_executor is None:
+        _node_probe_executor = ThreadPoolExecutor(max_workers=MAX_NODE_PROBES, thread_name_prefix="node-probe")
+    return _node_probe_executor
 
 
 async def get_filtered_modules(netuid: int, module_type: ModuleType, ss58_address: str = None, testnet=False) -> List[ModuleInfo]:
@@ -117,7 +141,8 @@ async def execute_miner_request(
         action: str,
         params: Dict[str, Any] = None,
         file: Any = None,
-        timeout: int = CALL_TIMEOUT
+        timeout: int = CALL_TIMEOUT,
+        session: Optional[ClientSession] = None
 ):
     """
     Executes a request to a miner and returns the response.
@@ -133,6 +158,7 @@ async def execute_miner_request(
         params (Dict[str, Any], optional): Additional parameters for the action. Defaults to an empty dictionary.
         files (Any): Additional parameters for the action. Defaults to None.
         timeout (int, optional): Timeout for the call.
+        session (ClientSession, optional): HTTP session to reuse connections from. A new one is opened if not provided.
 
     Raises:
         Exception: If an unexpected error occurs during the request.
@@ -142,7 +168,7 @@ async def execute_miner_request(
 
     try:
         client = ModuleClient(connection.ip, int(connection.port), validator_key)
-        miner_answer = await client.call(fn=action, target_key=miner_key, params=params, file=file, timeout=timeout)
+        miner_answer = await client.call(fn=action, target_key=miner_key, params=params, file=file, timeout=timeout, session=session)
 
     except Exception:
         miner_answer = None
@@ -150,18 +176,97 @@ async def execute_miner_request(
     return miner_answer
 
 
-@retry(RETRIES, [Exception])
 def make_client(node_url: str):
     return CommuneClient(url=node_url, num_connections=1, wait_for_finalization=False, timeout=10)
 
 
+def _try_make_client(node_url: str) -> Optional[CommuneClient]:
+    try:
+        return make_client(node_url)
+    except Exception:
+        logger.debug("Could not connect to node %s", node_url, exc_info=True)
+        return None
+
+
+def _close_unused_client(probe: Future, used_client: Optional[CommuneClient]):
+    if probe.cancelled():
+        return
+
+    probe_client = probe.result()
+    if probe_client is None or probe_client is used_client:
+        return
+
+    # CommuneClient has no close method, its node connections are kept in its connection queue
+    while True:
+        try:
+            connection = probe_client._connection_queue.get_nowait()
+        except queue.Empty:
+            break
+
+        try:
+            connection.close()
+        except Exception:
+            logger.debug("Error closing an unused node connection", exc_info=True)
+
+
+async def _connect_client(testnet: bool = False) -> CommuneClient:
+    """
+    Connects to the first Commune node that answers.
+
+    Up to MAX_NODE_PROBES nodes are tried in random order. When a node has not answered after NODE_PROBE_HEDGE_SECONDS, the next one is
+    probed concurrently instead of waiting for the first to time out, and the first successful connection wins.
+    A set of unreachable nodes therefore costs about one connection timeout instead of one per node.
+
+    Params:
+        testnet (bool): Whether to connect to a testnet node.
+
+    Returns:
+        CommuneClient: A client connected to one of the nodes.
+
+    Raises:
+        CommuneNetworkUnreachable: If none of the nodes could be reached.
+    """
+    comx_settings = ComxSettings()
+    node_urls = comx_settings.TESTNET_NODE_URLS if testnet else comx_settings.NODE_URLS
+
+    probes = []
+    pending = set()
+
+    def _first_client(futures) -> Optional[CommuneClient]:
+        return next((future.result() for future in futures if future.result() is not None), None)
+
+    for node_url in random.sample(node_urls, min(len(node_urls), MAX_NODE_PROBES)):
+        probe = _get_node_probe_executor().submit(_try_make_client, node_url)
+        probes.append(probe)
+        pending.add(asyncio.wrap_future(probe))
+        done, pending = await asyncio.wait(pending, timeout=NODE_PROBE_HEDGE_SECONDS, return_when=asyncio.FIRST_COMPLETED)
+        client = _first_client(done)
+        if client is not None:
+            break
+    else:
+        client = None
+        while pending and client is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            client = _first_client(done)
+
+    # Probes already running can not be cancelled, the clients they connect after the winner are closed instead
+    for probe in probes:
+        probe.cancel()
+        probe.add_done_callback(lambda finished_probe: _close_unused_client(finished_probe, client))
+
+    if client is None:
+        raise CommuneNetworkUnreachable()
+
+    return client
+
+
 def retry_on_failure(retries):
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, testnet=False, **kwargs):
             for i in range(retries):
-                client = make_client(get_node_url(use_testnet=testnet))
                 try:
+                    client = await _connect_client(testnet)
                     result = await func(client, *args, **kwargs)
                     return result
                 except Exception:
@@ -1,9 +1,9 @@
 import asyncio
 import hashlib
 import re
+from functools import lru_cache
 from typing import List, Optional
 
-import aiofiles
 from communex.types import Ss58Address
 from substrateinterface.utils.ss58 import is_valid_ss58_address, ss58_encode
 
@@ -11,6 +11,11 @@ from smartdrive.logging_config import logger
 from smartdrive.commune.models import ModuleInfo, ConnectionInfo
 from smartdrive.validator.constants import TRUTHFUL_STAKE_AMOUNT
 
+HASH_READ_BUFFER_SIZE = 1 << 20
+
+_OCTET_PATTERN = r"(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)"
+_IP_RE = re.compile(rf"(?<![\d.])(?:{_OCTET_PATTERN}\.){{3}}{_OCTET_PATTERN}:\d{{1,5}}(?!\d)")
+
 
 def filter_truthful_validators(active_validators: list[ModuleInfo]) -> List[ModuleInfo]:
     return list(filter(lambda validator: validator.stake > TRUTHFUL_STAKE_AMOUNT, active_validators))
@@ -31,14 +36,49 @@ def _extract_address(string: str) -> Optional[List[str]]:
         Optional[List[str]]: A list containing the IP address and port as strings if a match
                              is found, or None if no match is found.
     """
-    ip_regex = re.compile(r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}:\d+")
-    match = re.search(ip_regex, string)
+    fast_address = _extract_address_fast(string)
+    if fast_address:
+        return fast_address
+
+    match = _IP_RE.search(string)
     if match:
         return match.group(0).split(":")
 
     return None
 
 
+def _extract_address_fast(string: str) -> Optional[List[str]]:
+    """
+    Extract an IP address and port from a string that is exactly in the `a.b.c.d:port` form.
+
+    This is the common case for module addresses and avoids the regular expression engine
+    entirely. Any string that does not strictly follow that form is rejected so the caller can
+    fall back to the regular expression search.
+
+    Params:
+        string (str): The input string containing the IP address and port.
+
+    Returns:
+        Optional[List[str]]: A list containing the IP address and port as strings if the string
+                             is a well-formed address, or None otherwise.
+    """
+    ip, separator, port = string.partition(":")
+    if not separator or not 0 < len(port) <= 5 or not port.isascii() or not port.isdigit():
+        return None
+
+    octets = ip.split(".")
+    if len(octets) != 4:
+        return None
+
+    for octet in octets:
+        if not 0 < len(octet) <= 3 or not octet.isascii() or not octet.isdigit():
+            return None
+        if (len(octet) > 1 and octet[0] == "0") or int(octet) > 255:
+            return None
+
+    return [ip, port]
+
+
 def _get_ip_port(address_string: str) -> Optional[ConnectionInfo]:
     """
     Extract the IP address and port from a given address string and return them as a `ConnectionInfo` object.
@@ -65,10 +105,13 @@ def _get_ip_port(address_string: str) -> Optional[ConnectionInfo]:
         return None
 
 
+@lru_cache(maxsize=1024)
 def get_ss58_address_from_public_key(public_key_hex) -> Optional[Ss58Address]:
     """
     Convert a public key in hexadecimal format to an Ss58Address if valid.
 
+    Results are cached, as the same peers and users keep sending the same keys.
+
     Params:
         public_key_hex (str): The public key in hexadecimal format.
 
@@ -84,34 +127,38 @@ def calculate_hash_sync(path: str) -> str:
     """
     Calculates the SHA-256 hash of the file at the given path.
 
+    The file is read in large blocks into a reusable buffer, which hashlib processes without holding the GIL.
+
     Params:
         path (str): The path to the file to hash.
 
     Returns:
         str: The hexadecimal representation of the SHA-256 hash of the file.
     """
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    return loop.run_until_complete(calculate_hash(path))
+    sha256 = hashlib.sha256()
+    buffer = bytearray(HASH_READ_BUFFER_SIZE)
+    view = memoryview(buffer)
+
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            read_bytes = f.readinto(buffer)
+            if not read_bytes:
+                break
+            sha256.update(view[:read_bytes])
+
+    return sha256.hexdigest()
 
 
 async def calculate_hash(path: str) -> str:
     """
     Calculates the SHA-256 hash of the file at the given path.
 
+    The whole file is hashed in a worker thread, so the event loop is not blocked.
+
     Params:
         path (str): The path to the file to hash.
 
     Returns:
         str: The hexadecimal representation of the SHA-256 hash of the file.
     """
-    sha256 = hashlib.sha256()
-
-    async with aiofiles.open(path, 'rb') as f:
-        while True:
-            chunk = await f.read(16384)
-            if not chunk:
-                break
-            sha256.update(chunk)
-
-    return sha256.hexdigest()
+    return await asyncio.get_running_loop().run_in_executor(None, calculate_hash_sync, path)
@@ -20,7 +20,12 @@
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 #  SOFTWARE.
 
+import atexit
 import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from multiprocessing import util
 
 logger = logging.getLogger('smartdrive')
 logger.setLevel(logging.INFO)
@@ -28,4 +33,37 @@ console_handler = logging.StreamHandler()
 console_handler.setLevel(logging.INFO)
 formatter = logging.Formatter('%(levelname)s: %(message)s')
 console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
+
+# Records are only enqueued by the logging threads, a background listener writes them to the console so that
+# logging never blocks the event loop on a slow stdout.
+queue_handler = QueueHandler(queue.Queue(-1))
+logger.addHandler(queue_handler)
+
+_listener: QueueListener = None
+
+
+def _start_listener():
+    global _listener
+    _listener = QueueListener(queue_handler.queue, console_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_listener_in_child():
+    # The listener thread does not survive a fork, so the child process starts its own with a new queue
+    queue_handler.queue = queue.Queue(-1)
+    _start_listener()
+
+
+def _register_stop_in_process(_):
+    # Processes started by multiprocessing exit without running atexit handlers, their finalizers run instead
+    util.Finalize(None, _stop_listener, exitpriority=0)
+
+
+def _stop_listener():
+    _listener.stop()
+
+
+_start_listener()
+os.register_at_fork(after_in_child=_restart_listener_in_child)
+util.register_after_fork(queue_handler, _register_stop_in_process)
+atexit.register(_stop_listener)
@@ -44,7 +44,7 @@ from smartdrive.logging_config import logger
 from smartdrive.commune.request import get_modules
 from smartdrive.miner.middleware.miner_middleware import MinerMiddleware
 from smartdrive.miner.utils import has_enough_space, get_directory_size, parse_body
-from smartdrive.utils import DEFAULT_MINER_PATH, periodic_version_check
+from smartdrive.utils import DEFAULT_MINER_PATH, periodic_version_check, install_uvloop
 
 
 def get_config() -> Namespace:
@@ -306,4 +306,5 @@ if __name__ == "__main__":
 
         await run_tasks()
 
+    install_uvloop()
     asyncio.run(main())
@@ -20,7 +20,7 @@
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 #  SOFTWARE.
 
-from typing import Union
+from typing import List, Union
 from pydantic import BaseModel
 
 from communex.types import Ss58Address
@@ -60,6 +60,30 @@ def block_to_block_event(block: Block) -> BlockEvent:
     )
 
 
+def block_to_block_event_dict(block: Block, events: List[dict]) -> dict:
+    """
+    Builds the JSON representation of the BlockEvent of a Block from its already serialized events.
+
+    It is equivalent to `block_to_block_event(block).dict()`, without validating and serializing every event again.
+
+    Params:
+        block (Block): The Block object to be converted.
+        events (List[dict]): The serialized events of the block, in the same order.
+
+    Returns:
+        dict: The JSON representation of the BlockEvent.
+    """
+    return {
+        "block_number": block.block_number,
+        "events": [
+            {"event_action": event.get_event_action().value, "event": event_dict}
+            for event, event_dict in zip(block.events, events)
+        ],
+        "signed_block": block.signed_block,
+        "proposer_ss58_address": block.proposer_ss58_address
+    }
+
+
 def block_event_to_block(block_event: BlockEvent) -> Block:
     """
     Converts a BlockEvent object into a Block object.
@@ -21,11 +21,17 @@
 #  SOFTWARE.
 
 from enum import Enum
-from typing import List, Optional, Union
-from pydantic import BaseModel
+from typing import ClassVar, List, Optional, Type, TypeVar, Union
+from pydantic import BaseModel, TypeAdapter
 
 from communex.types import Ss58Address
 
+# Events reaching `parse_event` were already validated when the MessageEvent was built, so they are rebuilt
+# without running the validators again. Set to False to validate them again.
+TRUSTED_REPARSE = True
+
+ModelType = TypeVar("ModelType", bound=BaseModel)
+
 
 class Action(Enum):
     STORE = 0
@@ -88,6 +94,8 @@ class StoreRequestParams(EventParams):
 
 
 class Event(BaseModel):
+    ACTION: ClassVar[Optional[Action]] = None
+
     uuid: str
     validator_ss58_address: Ss58Address
     event_params: EventParams
@@ -103,15 +111,11 @@ class Event(BaseModel):
         Raises:
             ValueError: If the event type is unknown.
         """
-        if isinstance(self, StoreEvent):
-            return Action.STORE
-        elif isinstance(self, RemoveEvent):
-            return Action.REMOVE
-        elif isinstance(self, StoreRequestEvent):
-            return Action.STORE_REQUEST
-        else:
+        if self.ACTION is None:
             raise ValueError("Unknown event type")
 
+        return self.ACTION
+
 
 class UserEvent(Event):
     user_ss58_address: Ss58Address
@@ -120,16 +124,22 @@ class UserEvent(Event):
 
 
 class StoreEvent(UserEvent):
+    ACTION: ClassVar[Optional[Action]] = Action.STORE
+
     event_params: StoreParams
     input_params: StoreInputParams
 
 
 class RemoveEvent(UserEvent):
+    ACTION: ClassVar[Optional[Action]] = Action.REMOVE
+
     event_params: EventParams
     input_params: RemoveInputParams
 
 
 class StoreRequestEvent(UserEvent):
+    ACTION: ClassVar[Optional[Action]] = Action.STORE_REQUEST
+
     event_params: StoreRequestParams
     input_params: StoreRequestInputParams
 
@@ -143,16 +153,57 @@ class MessageEvent(BaseModel):
 
     @classmethod
     def from_json(cls, data: dict, event_action: Action):
-        if event_action == Action.STORE:
-            event = StoreEvent(**data)
-        elif event_action == Action.REMOVE:
-            event = RemoveEvent(**data)
-        elif event_action == Action.STORE_REQUEST:
-            event = StoreRequestEvent(**data)
-        else:
+        event_classes = _ACTION_TO_EVENT_CLASSES.get(event_action.value)
+        if event_classes is None:
             raise ValueError(f"Unknown action: {event_action}")
 
-        return cls(event_action=event_action, event=event)
+        event = event_classes[0](**data)
+        return cls.model_construct(event_action=event_action.value, event=event)
+
+
+_ACTION_TO_EVENT_CLASSES = {
+    Action.STORE.value: (StoreEvent, StoreInputParams),
+    Action.REMOVE.value: (RemoveEvent, RemoveInputParams),
+    Action.STORE_REQUEST.value: (StoreRequestEvent, StoreRequestInputParams),
+}
+
+_EVENT_LIST_ADAPTERS = {
+    action: TypeAdapter(List[event_class])
+    for action, (event_class, _) in _ACTION_TO_EVENT_CLASSES.items()
+}
+
+
+def message_events_from_json(data: List[dict]) -> List[MessageEvent]:
+    """
+    Builds MessageEvent objects from their JSON representation.
+
+    Events are grouped by action and each group is validated in a single call, instead of validating the
+    events one by one. The original order of the events is preserved.
+
+    Params:
+        data (List[dict]): The JSON representation of the MessageEvents.
+
+    Returns:
+        List[MessageEvent]: The MessageEvent objects.
+
+    Raises:
+        ValueError: If the event action is unknown.
+    """
+    indexes_by_action = {}
+    for index, message_event in enumerate(data):
+        indexes_by_action.setdefault(message_event["event_action"], []).append(index)
+
+    message_events = [None] * len(data)
+    for event_action, indexes in indexes_by_action.items():
+        adapter = _EVENT_LIST_ADAPTERS.get(event_action)
+        if adapter is None:
+            raise ValueError(f"Unknown action: {event_action}")
+
+        events = adapter.validate_python([data[index]["event"] for index in indexes])
+        for index, event in zip(indexes, events):
+            message_events[index] = MessageEvent.model_construct(event_action=event_action, event=event)
+
+    return message_events
 
 
 def parse_event(message_event: MessageEvent) -> Union[StoreEvent, RemoveEvent, StoreRequestEvent]:
@@ -169,7 +220,7 @@ def parse_event(message_event: MessageEvent) -> Union[StoreEvent, RemoveEvent, S
         ValueError: If the event action is unknown.
     """
     uuid = message_event.event.uuid
-    validator_ss58_address = Ss58Address(message_event.event.validator_ss58_address)
+    validator_ss58_address = message_event.event.validator_ss58_address
     event_params = message_event.event.event_params
     event_signed_params = message_event.event.event_signed_params
 
@@ -180,26 +231,32 @@ def parse_event(message_event: MessageEvent) -> Union[StoreEvent, RemoveEvent, S
         "event_signed_params": event_signed_params
     }
 
-    if message_event.event_action == Action.STORE.value:
-        return StoreEvent(
-            **common_params,
-            user_ss58_address=Ss58Address(message_event.event.user_ss58_address),
-            input_params=StoreInputParams(file_hash=message_event.event.input_params.file_hash, file_size_bytes=message_event.event.input_params.file_size_bytes),
-            input_signed_params=message_event.event.input_signed_params
-        )
-    elif message_event.event_action == Action.REMOVE.value:
-        return RemoveEvent(
-            **common_params,
-            user_ss58_address=Ss58Address(message_event.event.user_ss58_address),
-            input_params=RemoveInputParams(file_uuid=message_event.event.input_params.file_uuid),
-            input_signed_params=message_event.event.input_signed_params
-        )
-    elif message_event.event_action == Action.STORE_REQUEST.value:
-        return StoreRequestEvent(
-            **common_params,
-            user_ss58_address=Ss58Address(message_event.event.user_ss58_address),
-            input_params=StoreRequestInputParams(file_hash=message_event.event.input_params.file_hash, file_size_bytes=message_event.event.input_params.file_size_bytes),
-            input_signed_params=message_event.event.input_signed_params
-        )
-    else:
+    event_classes = _ACTION_TO_EVENT_CLASSES.get(message_event.event_action)
+    if event_classes is None:
         raise ValueError(f"Unknown action: {message_event.event_action}")
+
+    event_class, input_params_class = event_classes
+    return _build_model(
+        event_class,
+        **common_params,
+        user_ss58_address=message_event.event.user_ss58_address,
+        input_params=_build_model(input_params_class, **message_event.event.input_params.dict()),
+        input_signed_params=message_event.event.input_signed_params
+    )
+
+
+def _build_model(model_class: Type[ModelType], **fields) -> ModelType:
+    """
+    Builds a model from fields that have already been validated.
+
+    Params:
+        model_class (Type[ModelType]): The model class to build.
+        **fields: The fields of the model.
+
+    Returns:
+        ModelType: The model, validated again only if TRUSTED_REPARSE is disabled.
+    """
+    if TRUSTED_REPARSE:
+        return model_class.model_construct(**fields)
+
+    return model_class.model_validate(fields)
@@ -21,26 +21,27 @@
 #  SOFTWARE.
 
 import json
+from functools import lru_cache
 from typing import Union
 
 from substrateinterface import Keypair
 
 
-def sign_data(data: dict, keypair: Keypair) -> bytes:
+def sign_data(data: Union[dict, bytes], keypair: Keypair) -> bytes:
     """
     Signs the provided JSON data using the given keypair.
 
     This function takes a dictionary representing the JSON data, converts it to a UTF-8 encoded byte string,
-    and then signs the byte string using the provided keypair.
+    and then signs the byte string using the provided keypair. Already serialized data can be passed as bytes.
 
     Params:
-        data (dict): The data to be signed.
+        data (Union[dict, bytes]): The data to be signed. It can be either a dictionary or bytes.
         keypair (Keypair): The keypair used to sign the JSON data.
 
     Returns:
         bytes: The generated signature in bytes format.
     """
-    message = json.dumps(data).encode('utf-8')
+    message = data if isinstance(data, bytes) else json.dumps(data).encode('utf-8')
     signature = keypair.sign(message)
 
     return signature
@@ -62,9 +63,25 @@ def verify_data_signature(data: Union[dict, bytes], signature_hex: str, ss58_add
     Returns:
         bool: True if the signature is valid, otherwise False.
     """
-    keypair = Keypair(ss58_address=ss58_address)
+    keypair = _get_verification_keypair(ss58_address)
     message = data if isinstance(data, bytes) else json.dumps(data).encode('utf-8')
     signature = bytes.fromhex(signature_hex)
     is_valid = keypair.verify(message, signature)
 
     return is_valid
+
+
+@lru_cache(maxsize=1024)
+def _get_verification_keypair(ss58_address: str) -> Keypair:
+    """
+    Returns a public-only Keypair for the given SS58 address.
+
+    Decoding the address is cached, as the same validators and users sign most of the verified data.
+
+    Params:
+        ss58_address (str): The SS58 address associated with the public key.
+
+    Returns:
+        Keypair: The Keypair used to verify signatures of the given address.
+    """
+    return Keypair(ss58_address=ss58_address)
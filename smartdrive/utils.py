@@ -21,6 +21,11 @@
 #  SOFTWARE.
 
 import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from typing import Any, Awaitable, Dict, FrozenSet, List, Optional
 
 from communex.balance import from_nano
 from communex.types import Ss58Address
@@ -30,6 +35,9 @@ from smartdrive import logger
 from smartdrive.commune.request import get_staketo
 from smartdrive.commune.models import ModuleInfo
 
+MB = 1 << 20
+GB = 1 << 30
+
 INITIAL_STORAGE = 50 * 1024 * 1024  # 50 MB
 MAXIMUM_STORAGE = 2 * 1024 * 1024 * 1024  # 2 GB
 ADDITIONAL_STORAGE_PER_COMAI = 0.1 * 1024 * 1024  # 0.1 MB
@@ -40,8 +48,21 @@ DEFAULT_VALIDATOR_PATH = "~/.smartdrive/validator"
 DEFAULT_CLIENT_PATH = "~/.smartdrive/client"
 
 INTERVAL_CHECK_VERSION_SECONDS = 12 * 60 * 60  # 12 hours
+MAX_WAITING_THREADS = 4
+
+_wait_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _reset_wait_executor():
+    global _wait_executor
+    _wait_executor = None
+
 
+# Worker threads do not survive a fork, the child process creates its own executor when it needs it
+os.register_at_fork(after_in_child=_reset_wait_executor)
 
+
+@lru_cache(maxsize=4096)
 def calculate_storage_capacity(stake: float) -> int:
     """
     Calculates the storage capacity based on the user's stake,
@@ -76,20 +97,186 @@ def format_size(size_in_bytes: int) -> str:
     Returns:
         str: The size formatted in MB or GB.
     """
-    size_in_mb = size_in_bytes / (1024 * 1024)
-    if size_in_mb >= 1024:
-        size_in_gb = size_in_mb / 1024
-        return f"{size_in_gb:.2f} GB"
+    if size_in_bytes >= GB:
+        return f"{size_in_bytes / GB:.2f} GB"
     else:
-        return f"{size_in_mb:.2f} MB"
+        return f"{size_in_bytes / MB:.2f} MB"
+
 
+def get_validator_addresses(validators: List[ModuleInfo]) -> FrozenSet[str]:
+    """
+    Builds the set of SS58 addresses of the given validators.
 
-async def get_stake_from_user(user_ss58_address: Ss58Address, validators: [ModuleInfo]):
+    Params:
+        validators (List[ModuleInfo]): The validators.
+
+    Returns:
+        FrozenSet[str]: The SS58 addresses of the validators.
+    """
+    return frozenset(validator.ss58_address for validator in validators)
+
+
+async def get_stake_from_user(user_ss58_address: Ss58Address, validator_addresses: FrozenSet[str]):
     staketo_modules = await get_staketo(user_ss58_address)
-    validator_addresses = {validator.ss58_address for validator in validators}
-    active_stakes = {address: from_nano(stake) for address, stake in staketo_modules.items() if address in validator_addresses and address != str(user_ss58_address)}
+    return calculate_active_stake(user_ss58_address, staketo_modules, validator_addresses)
+
+
+def calculate_active_stake(user_ss58_address: Ss58Address, staketo_modules: Dict[str, int], validator_addresses: FrozenSet[str]) -> float:
+    """
+    Calculates the stake a user has delegated to the given validators, excluding self-stake.
+
+    Params:
+        user_ss58_address (Ss58Address): The SS58 address of the user.
+        staketo_modules (Dict[str, int]): The user's stake per module address, in nano.
+        validator_addresses (FrozenSet[str]): The SS58 addresses of the validators whose stake is taken into account.
+
+    Returns:
+        float: The total active stake in COMAI.
+    """
+    user_address = str(user_ss58_address)
+    return sum(from_nano(stake) for address, stake in staketo_modules.items() if address in validator_addresses and address != user_address)
+
+
+def async_ttl_cache(ttl: float, maxsize: int = 1024):
+    """
+    Decorator that caches the result of a coroutine function for a period of time.
+
+    Results are keyed by the positional arguments of the call. Concurrent calls with the same arguments share a
+    single invocation of the function. Exceptions are not cached, so a failing call is retried on the next
+    invocation. Every caller receives the same result object, so it must not be mutated; functions returning
+    sequences should return tuples.
+
+    Params:
+        ttl (float): Seconds a cached result remains valid.
+        maxsize (int): Maximum number of cached results.
+
+    Returns:
+        Callable: The decorator.
+    """
+    def decorator(func):
+        cache = {}
+        # Per key lock and number of calls using it, the lock is only dropped once no call is waiting on it
+        locks = {}
+
+        def _get_fresh(key):
+            entry = cache.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return True, entry[1]
+            return False, None
+
+        @wraps(func)
+        async def wrapper(*args):
+            found, value = _get_fresh(args)
+            if found:
+                return value
+
+            lock, users = locks.get(args, (None, 0))
+            if lock is None:
+                lock = asyncio.Lock()
+            locks[args] = (lock, users + 1)
+            try:
+                async with lock:
+                    found, value = _get_fresh(args)
+                    if found:
+                        return value
+
+                    value = await func(*args)
+
+                    now = time.monotonic()
+                    if len(cache) >= maxsize:
+                        for key in [key for key, (expiry, _) in cache.items() if expiry <= now]:
+                            del cache[key]
+                        if len(cache) >= maxsize:
+                            del cache[next(iter(cache))]
+
+                    cache[args] = (now + ttl, value)
+                    return value
+            finally:
+                _, users = locks[args]
+                if users == 1:
+                    del locks[args]
+                else:
+                    locks[args] = (lock, users - 1)
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+def install_uvloop() -> bool:
+    """
+    Makes asyncio create uvloop event loops, which are considerably faster on sockets, when uvloop is installed.
+
+    It must be called before the event loop of the process is created. Without uvloop, the standard event loop is kept.
+
+    Returns:
+        bool: True if uvloop is used, False otherwise.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+async def wait_event(event, timeout: float) -> bool:
+    """
+    Waits until a threading or multiprocessing event is set without blocking the event loop.
+
+    The waits block their threads for up to the whole timeout, so they run in a small executor of their own instead
+    of taking the workers of the default executor, which signs blocks, hashes files and calls the Commune nodes.
+
+    Params:
+        event: The event to wait for, anything with a `wait(timeout)` method returning whether it is set.
+        timeout (float): Maximum number of seconds to wait.
+
+    Returns:
+        bool: True if the event is set, False if the timeout expired first.
+    """
+    global _wait_executor
+    if _wait_executor is None:
+        _wait_executor = ThreadPoolExecutor(max_workers=MAX_WAITING_THREADS, thread_name_prefix="event-wait")
+    return await asyncio.get_running_loop().run_in_executor(_wait_executor, event.wait, timeout)
+
+
+async def gather_or_cancel(*aws: Awaitable) -> List[Any]:
+    """
+    Runs the awaitables concurrently and returns their results in order, like `asyncio.gather`.
+
+    Unlike `asyncio.gather`, as soon as one of them fails the remaining ones are cancelled and awaited before the
+    exception is raised, so no task keeps running in the background once the caller has given up.
+    `asyncio.TaskGroup` provides this from Python 3.11, but 3.10 is still supported.
+
+    Params:
+        aws (Awaitable): The coroutines or futures to run.
+
+    Returns:
+        List[Any]: The results of the awaitables, in the same order.
+
+    Raises:
+        Exception: The first exception raised by any of the awaitables.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    if not tasks:
+        return []
+
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        exceptions = [task.exception() for task in tasks if task in done and not task.cancelled()]
+        exception = next((exception for exception in exceptions if exception is not None), None)
+        if exception is not None:
+            raise exception
+    finally:
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
 
-    return sum(active_stakes.values())
+    return [task.result() for task in tasks]
 
 
 async def periodic_version_check():
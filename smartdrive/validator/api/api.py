@@ -56,6 +56,8 @@ class API:
         self._app.add_api_route(RETRIEVE_ENDPOINT, self._retrieve_api.retrieve_endpoint, methods=["GET"])
         self._app.add_api_route(REMOVE_ENDPOINT, self._remove_api.remove_endpoint, methods=["DELETE"])
 
+        self._app.add_event_handler("shutdown", self._store_api.close)
+
     async def run_server(self) -> None:
         """
         Starts and runs an asynchronous web server using Uvicorn.
@@ -20,36 +20,96 @@
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 #  SOFTWARE.
 
+import asyncio
+import functools
+import hashlib
 import json
+from collections import OrderedDict
 from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 from starlette.types import ASGIApp
-from typing import Awaitable, Callable
+from typing import Awaitable, Callable, Dict, FrozenSet, Tuple
 
 from substrateinterface import Keypair
 from communex.compat.key import classic_load_key
+from communex.types import Ss58Address
+
 from smartdrive.commune.errors import CommuneNetworkUnreachable
-from smartdrive.commune.request import get_filtered_modules
+from smartdrive.commune.models import ModuleInfo
+from smartdrive.commune.request import get_filtered_modules, get_staketo
 from smartdrive.commune.utils import get_ss58_address_from_public_key
 from smartdrive.sign import verify_data_signature
-from smartdrive.utils import MINIMUM_STAKE, get_stake_from_user
+from smartdrive.utils import MINIMUM_STAKE, async_ttl_cache, calculate_active_stake, get_validator_addresses
 from smartdrive.validator.api.endpoints import PING_ENDPOINT, STORE_ENDPOINT, STORE_REQUEST_ENDPOINT
 from smartdrive.validator.config import config_manager
 from smartdrive.validator.models.models import ModuleType
 
 Callback = Callable[[Request], Awaitable[Response]]
-exclude_paths = [PING_ENDPOINT]
+exclude_paths = frozenset({PING_ENDPOINT})
+stake_required_paths = frozenset({STORE_REQUEST_ENDPOINT, STORE_ENDPOINT})
+
+_load_key = functools.lru_cache(maxsize=4)(classic_load_key)
+
+VALIDATORS_CACHE_TTL_SECONDS = 30
+STAKETO_CACHE_TTL_SECONDS = 12
+VERIFIED_SIGNATURES_CACHE_SIZE = 8192
+
+_verified_signatures: OrderedDict = OrderedDict()
+
+
+@async_ttl_cache(ttl=VALIDATORS_CACHE_TTL_SECONDS)
+async def _get_validators(netuid: int) -> Tuple[Tuple[ModuleInfo, ...], FrozenSet[str]]:
+    validators = tuple(await get_filtered_modules(netuid, ModuleType.VALIDATOR))
+    return validators, get_validator_addresses(validators)
+
+
+@async_ttl_cache(ttl=STAKETO_CACHE_TTL_SECONDS)
+async def _get_staketo(ss58_address: Ss58Address) -> Dict[str, int]:
+    return await get_staketo(ss58_address)
+
+
+def _verify_signature(body: dict, signature: str, ss58_address: Ss58Address) -> bool:
+    """
+    Verifies the signature of a request body, remembering the signatures already verified.
+
+    A signature over the same body by the same address is always valid once it has been verified, so repeated
+    requests skip the signature algorithm.
+
+    Params:
+        body (dict): The request body.
+        signature (str): The signature in hexadecimal format.
+        ss58_address (Ss58Address): The SS58 address of the signer.
+
+    Returns:
+        bool: True if the signature is valid, otherwise False.
+    """
+    message = json.dumps(body).encode("utf-8")
+    cache_key = (ss58_address, signature, hashlib.blake2b(message, digest_size=16).digest())
+    if cache_key in _verified_signatures:
+        _verified_signatures.move_to_end(cache_key)
+        return True
+
+    if not verify_data_signature(message, signature, ss58_address):
+        return False
+
+    _verified_signatures[cache_key] = True
+    if len(_verified_signatures) > VERIFIED_SIGNATURES_CACHE_SIZE:
+        _verified_signatures.popitem(last=False)
+
+    return True
 
 
 # TODO: Should be refactorized
 class APIMiddleware(BaseHTTPMiddleware):
 
     _key: Keypair = None
+    _netuid: int = None
 
     def __init__(self, app: ASGIApp):
         super().__init__(app)
-        self._key = classic_load_key(config_manager.config.key)
+        self._key = _load_key(config_manager.config.key)
+        self._netuid = config_manager.config.netuid
 
     async def dispatch(self, request: Request, call_next: Callback) -> Response:
         """
@@ -77,7 +137,8 @@ class APIMiddleware(BaseHTTPMiddleware):
                 content={"detail": detail}
             )
 
-        if request.url.path in exclude_paths:
+        path = request.url.path
+        if path in exclude_paths:
             return await call_next(request)
 
         if request.client is None:
@@ -91,37 +152,43 @@ class APIMiddleware(BaseHTTPMiddleware):
         if not ss58_address:
             return _error_response(401, "Not a valid public key provided")
 
-        if request.url.path in [STORE_REQUEST_ENDPOINT, STORE_ENDPOINT]:
-            try:
-                validators = await get_filtered_modules(config_manager.config.netuid, ModuleType.VALIDATOR)
-            except CommuneNetworkUnreachable:
-                return _error_response(404, "Currently the Commune network is unreachable")
-
-            total_stake = await get_stake_from_user(user_ss58_address=ss58_address, validators=validators)
-            if total_stake < MINIMUM_STAKE:
-                return _error_response(401, f"You must stake at least {MINIMUM_STAKE} COMAI in total to active validators")
-
-            request.state.total_stake = total_stake
-
         signature = request.headers.get('X-Signature')
+        if not signature:
+            return _error_response(401, "Valid X-Signature not provided on headers")
+
         body = {}
         if request.method == "GET" or request.method == "DELETE":
             body = dict(request.query_params)
         else:
-            content_type = request.headers.get("Content-Type")
-            if content_type and "application/json" in content_type:
+            is_json = "application/json" in request.headers.get("Content-Type", "")
+            if is_json:
                 body_bytes = await request.body()
                 if body_bytes:
                     try:
-                        body = await request.json()
+                        body = json.loads(body_bytes)
                     except json.JSONDecodeError:
                         return _error_response(401, "Invalid JSON")
             elif request.headers.get("X-File-Size", None):
                 body = {"file_hash": request.headers.get("X-File-Hash"), "file_size_bytes": int(request.headers.get("X-File-Size"))}
 
-        is_verified_signature = verify_data_signature(body, signature, ss58_address)
+        is_verified_signature = _verify_signature(body, signature, ss58_address)
         if not is_verified_signature:
             return _error_response(401, "Valid X-Signature not provided on headers")
 
+        if path in stake_required_paths:
+            try:
+                (_, validator_addresses), staketo_modules = await asyncio.gather(
+                    _get_validators(self._netuid),
+                    _get_staketo(ss58_address)
+                )
+            except CommuneNetworkUnreachable:
+                return _error_response(404, "Currently the Commune network is unreachable")
+
+            total_stake = calculate_active_stake(user_ss58_address=ss58_address, staketo_modules=staketo_modules, validator_addresses=validator_addresses)
+            if total_stake < MINIMUM_STAKE:
+                return _error_response(401, f"You must stake at least {MINIMUM_STAKE} COMAI in total to active validators")
+
+            request.state.total_stake = total_stake
+
         response = await call_next(request)
         return response
@@ -37,7 +37,7 @@ from substrateinterface import Keypair
 from communex.types import Ss58Address
 
 from smartdrive.commune.errors import CommuneNetworkUnreachable
-from smartdrive.utils import DEFAULT_VALIDATOR_PATH
+from smartdrive.utils import DEFAULT_VALIDATOR_PATH, gather_or_cancel
 from smartdrive.validator.api.exceptions import FileDoesNotExistException, \
     CommuneNetworkUnreachable as HTTPCommuneNetworkUnreachable, NoMinersInNetworkException, FileNotAvailableException, \
     ChunkNotAvailableException
@@ -58,11 +58,13 @@ MAX_SIMULTANEOUS_DOWNLOADS = 4
 class RetrieveAPI:
     _node: Node = None
     _key: Keypair = None
+    _netuid: int = None
     _database: Database = None
 
     def __init__(self, node: Node):
         self._node = node
         self._key = classic_load_key(config_manager.config.key)
+        self._netuid = config_manager.config.netuid
         self._database = Database()
 
     async def retrieve_endpoint(self, request: Request, file_uuid: str, background_tasks: BackgroundTasks):
@@ -98,7 +100,7 @@ class RetrieveAPI:
             raise FileDoesNotExistException
 
         try:
-            miners = await get_filtered_modules(config_manager.config.netuid, ModuleType.MINER)
+            miners = await get_filtered_modules(self._netuid, ModuleType.MINER)
         except CommuneNetworkUnreachable:
             raise HTTPCommuneNetworkUnreachable
 
@@ -155,7 +157,7 @@ class RetrieveAPI:
         ]
 
         try:
-            retrieve_requests = await asyncio.gather(*retrieve_request_tasks)
+            retrieve_requests = await gather_or_cancel(*retrieve_request_tasks)
         except ChunkNotAvailableException:
             # If any chunk fails to be retrieved, we stop the process and raise the exception
             shutil.rmtree(user_path)
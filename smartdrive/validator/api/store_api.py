@@ -27,9 +27,11 @@ import random
 import shutil
 import time
 import uuid
-from typing import Optional, Tuple, List, Union, AsyncGenerator
+from collections import deque
+from typing import Optional, Tuple, List, Union, AsyncGenerator, Dict
 
 import aiofiles
+from aiohttp import ClientSession, TCPConnector
 from fastapi import Request
 from starlette.responses import JSONResponse
 from substrateinterface import Keypair
@@ -39,7 +41,7 @@ from communex.types import Ss58Address
 
 from smartdrive.check_file import check_file
 from smartdrive.commune.errors import CommuneNetworkUnreachable
-from smartdrive.utils import DEFAULT_VALIDATOR_PATH
+from smartdrive.utils import DEFAULT_VALIDATOR_PATH, async_ttl_cache, gather_or_cancel
 from smartdrive.sign import sign_data
 from smartdrive.validator.api.exceptions import RedundancyException, NoMinersInNetworkException, \
     NoValidMinerResponseException, UnexpectedErrorException, HTTPRedundancyException, \
@@ -67,20 +69,51 @@ MAX_ENCODED_RANGE = 50
 MINER_STORE_TIMEOUT_SECONDS = 2 * 60
 TIME_EXPIRATION_STORE_REQUEST_EVENT_SECONDS = 20 * 60
 MAX_CHUNK_SIZE = 100 * 1024 * 1024  # Max chunk size to store, 100 MB
+WRITE_BUFFER_SIZE = 4 * 1024 * 1024  # Received data buffered before writing it to disk, 4 MB
 MAX_SIMULTANEOUS_UPLOADS = 4
 MAX_SIMULTANEOUS_VALIDATIONS = 15
+MINERS_CACHE_TTL_SECONDS = 15
+MINER_LATENCY_EWMA_ALPHA = 0.3
+
+# Exponentially weighted moving average of the store latency of each miner, in seconds
+_miner_store_latencies: Dict[str, float] = {}
+
+
+@async_ttl_cache(ttl=MINERS_CACHE_TTL_SECONDS)
+async def _get_miners(netuid: int, ss58_address: str) -> Tuple[ModuleInfo, ...]:
+    return tuple(await get_filtered_modules(netuid, ModuleType.MINER, ss58_address))
 
 
 class StoreAPI:
     _node: Node = None
     _key: Keypair = None
+    _netuid: int = None
     _database: Database = None
+    _session: Optional[ClientSession] = None
 
     def __init__(self, node: Node):
         self._node = node
         self._key = classic_load_key(config_manager.config.key)
+        self._netuid = config_manager.config.netuid
         self._database = Database()
 
+    def _get_session(self) -> ClientSession:
+        """
+        Returns the HTTP session shared by all the requests made to miners, creating it on first use.
+
+        The session must be created inside the running event loop, so it can not be opened in `__init__`.
+        """
+        if self._session is None or self._session.closed:
+            self._session = ClientSession(connector=TCPConnector(limit=0, limit_per_host=MAX_SIMULTANEOUS_UPLOADS))
+        return self._session
+
+    async def close(self):
+        """
+        Closes the shared HTTP session and its pooled connections.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
     async def store_request_endpoint(self, request: Request):
         """
         Handle a storage request event and register it in the system.
@@ -104,7 +137,8 @@ class StoreAPI:
         user_public_key = request.headers.get("X-Key")
         user_ss58_address = get_ss58_address_from_public_key(user_public_key)
         input_signed_params = request.headers.get("X-Signature")
-        file_uuid = f"{int(time.time())}_{str(uuid.uuid4())}"
+        now = int(time.time())
+        file_uuid = f"{now}_{str(uuid.uuid4())}"
         total_stake = request.state.total_stake
 
         validate_storage_capacity(
@@ -114,11 +148,11 @@ class StoreAPI:
             total_stake=total_stake,
         )
 
-        event_params = StoreRequestParams(file_uuid=file_uuid, expiration_at=int(time.time()) + TIME_EXPIRATION_STORE_REQUEST_EVENT_SECONDS, approved=True)
+        event_params = StoreRequestParams(file_uuid=file_uuid, expiration_at=now + TIME_EXPIRATION_STORE_REQUEST_EVENT_SECONDS, approved=True)
         signed_params = sign_data(event_params.dict(), self._key)
 
         event = StoreRequestEvent(
-            uuid=f"{int(time.time())}_{str(uuid.uuid4())}",
+            uuid=f"{now}_{str(uuid.uuid4())}",
             validator_ss58_address=Ss58Address(self._key.ss58_address),
             event_params=event_params,
             event_signed_params=signed_params.hex(),
@@ -204,7 +238,7 @@ class StoreAPI:
         )
 
         try:
-            miners = await get_filtered_modules(config_manager.config.netuid, ModuleType.MINER, self._key.ss58_address)
+            miners = await _get_miners(self._netuid, self._key.ss58_address)
         except CommuneNetworkUnreachable:
             raise HTTPCommuneNetworkUnreachable
 
@@ -222,7 +256,8 @@ class StoreAPI:
                 file_size_bytes=file_size,
                 file_hash=file_hash,
                 file_uuid=file_uuid,
-                validators_len=len(active_connections) + 1  # To include myself
+                validators_len=len(active_connections) + 1,  # To include myself
+                session=self._get_session()
             )
         except RedundancyException as redundancy_exception:
             raise HTTPRedundancyException(redundancy_exception.message)
@@ -236,7 +271,7 @@ class StoreAPI:
             self._node.distribute_event(store_event)
 
             if validations_events_per_validator:
-                self._database.insert_validation_events(validation_events=validations_events_per_validator.pop(0))
+                await self._database.insert_validation_events_async(validation_events=validations_events_per_validator.pop(0))
 
                 for index, active_connection in enumerate(active_connections):
                     data_list = [validations_events.dict() for validations_events in validations_events_per_validator[index]]
@@ -271,15 +306,19 @@ async def store_new_file(
         file_hash: str,
         file_uuid: str = None,
         file_size_bytes: int = None,
+        session: Optional[ClientSession] = None
 ) -> Tuple[Optional[StoreEvent], List[List[ValidationEvent]]]:
     validating = isinstance(file, str)
-    store_event_uuid = f"{int(time.time())}_{str(uuid.uuid4())}"
+    now = int(time.time())
+    store_event_uuid = f"{now}_{str(uuid.uuid4())}"
 
     if not validating and len(miners) < MIN_MINERS_FOR_FILE:
         raise RedundancyException
 
-    stored_chunks_results = []
-    stored_miner_with_chunk_uuid: List[Tuple[ModuleInfo, str]] = []
+    # One slot per expected stored chunk (miner, chunk_uuid, chunk_index, chunk_path), written by index once the
+    # number of chunks is known. Replicas of chunk i take the slots from i * MIN_MINERS_REPLICATION_FOR_CHUNK.
+    stored_chunks: List[Optional[Tuple[ModuleInfo, str, int, str]]] = []
+    stored_replicas: List[int] = []
 
     semaphore = asyncio.Semaphore(MAX_SIMULTANEOUS_VALIDATIONS if validating else MAX_SIMULTANEOUS_UPLOADS)
 
@@ -287,34 +326,55 @@ async def store_new_file(
     chunks_params: List[ChunkParams] = []
 
     if not file_uuid:
-        file_uuid = f"{int(time.time())}_{str(uuid.uuid4())}"
+        file_uuid = f"{now}_{str(uuid.uuid4())}"
 
     async def handle_store_request(miner: ModuleInfo, chunk_path: str, chunk_index: int) -> bool:
+        start_time = time.monotonic()
         miner_answer = await _store_request(
             keypair=validator_keypair,
             miner=miner,
             user_ss58_address=user_ss58_address,
-            chunk_path=chunk_path
+            chunk_path=chunk_path,
+            session=session
         )
+        _record_store_latency(miner.ss58_address, time.monotonic() - start_time if miner_answer else MINER_STORE_TIMEOUT_SECONDS)
         if miner_answer:
-            stored_chunks_results.append((miner_answer.chunk_uuid, chunk_index, miner.ss58_address, chunk_path))
-            stored_miner_with_chunk_uuid.append((miner, miner_answer.chunk_uuid))
+            slot_index = chunk_index * MIN_MINERS_REPLICATION_FOR_CHUNK + stored_replicas[chunk_index]
+            stored_replicas[chunk_index] += 1
+            stored_chunks[slot_index] = (miner, miner_answer.chunk_uuid, chunk_index, chunk_path)
             return True
         return False
 
     async def store_chunk_with_redundancy(chunk_path: str, chunk_index: int):
-        available_miners = miners.copy()
-        random.shuffle(available_miners)
-        replication_count = 0
+        available_miners = deque(_rank_miners(miners))
+        pending = set()
 
-        while replication_count < MIN_MINERS_REPLICATION_FOR_CHUNK and available_miners:
-            miner = available_miners.pop()
+        async def store_with_limit(miner: ModuleInfo) -> bool:
             async with semaphore:
-                success = await handle_store_request(miner, chunk_path, chunk_index)
-                if success:
-                    replication_count += 1
+                return await handle_store_request(miner, chunk_path, chunk_index)
+
+        # Keep as many requests in flight as replicas are still missing, replacing each failed one as soon as it
+        # fails instead of waiting for the rest to finish. Successful stores are counted per chunk as they happen, so
+        # a chunk never gets more replicas than required.
+        try:
+            while stored_replicas[chunk_index] < MIN_MINERS_REPLICATION_FOR_CHUNK:
+                while available_miners and len(pending) < MIN_MINERS_REPLICATION_FOR_CHUNK - stored_replicas[chunk_index]:
+                    pending.add(asyncio.create_task(store_with_limit(available_miners.pop())))
+
+                # Without miners left the chunk can not reach its replicas, failing here lets gather_or_cancel
+                # stop the uploads of the other chunks right away
+                if not pending:
+                    raise RedundancyException
+
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
 
     async def remove_stored_chunks():
+        stored_miner_with_chunk_uuid = [(slot[0], slot[1]) for slot in stored_chunks if slot]
         if stored_miner_with_chunk_uuid:
             remove_tasks = [
                 asyncio.create_task(
@@ -322,7 +382,8 @@ async def store_new_file(
                         keypair=validator_keypair,
                         user_ss58_address=user_ss58_address,
                         miner=miner,
-                        chunk_uuid=chunk_uuid
+                        chunk_uuid=chunk_uuid,
+                        session=session
                     )
                 )
                 for miner, chunk_uuid in stored_miner_with_chunk_uuid
@@ -338,86 +399,139 @@ async def store_new_file(
 
                 await asyncio.gather(*[handle_with_limit(miner) for miner in miners], return_exceptions=True)
 
+            # A single chunk is stored in every miner, so there is a slot per miner
+            stored_chunks = [None] * len(miners)
+            stored_replicas = [0]
             await gather_with_semaphore(miners, file)
+
+            stored_chunks_results = [slot for slot in stored_chunks if slot]
             if not stored_chunks_results:
                 return None, []
 
         else:
             sha256 = hashlib.sha256()
-            current_chunk_index = 0
-            current_chunk_size = 0
             total_size = 0
             chunk_paths = []
 
             path = os.path.expanduser(DEFAULT_VALIDATOR_PATH)
             user_path = os.path.join(path, store_event_uuid)
             os.makedirs(user_path, exist_ok=True)
-            chunk_path = os.path.join(user_path, f"chunk_{current_chunk_index}.part")
-            async with aiofiles.open(chunk_path, "wb") as f:
-                async for chunk in file:
-                    total_size += len(chunk)
-                    sha256.update(chunk)
-                    await f.write(chunk)
-                    current_chunk_size += len(chunk)
-
-                    if current_chunk_size >= MAX_CHUNK_SIZE:
-                        chunk_paths.append((chunk_path, current_chunk_index))
-                        current_chunk_index += 1
+
+            chunk_sizes = _get_chunk_sizes(file_size_bytes)
+            chunk_file = None
+            chunk_path = None
+            current_chunk_size = 0
+            current_chunk_limit = 0
+
+            async def write_to_chunks(data: bytearray):
+                nonlocal chunk_file, chunk_path, current_chunk_size, current_chunk_limit
+
+                view = memoryview(data)
+                while view:
+                    if chunk_file is None:
+                        chunk_index = len(chunk_paths)
+                        chunk_path = os.path.join(user_path, f"chunk_{chunk_index}.part")
+                        chunk_file = await aiofiles.open(chunk_path, "wb")
+                        # Data beyond the declared size is kept in extra chunks, check_file rejects the file afterward
+                        current_chunk_limit = chunk_sizes[chunk_index] if chunk_index < len(chunk_sizes) else MAX_CHUNK_SIZE
+
+                    piece = view[:current_chunk_limit - current_chunk_size]
+                    await chunk_file.write(piece)
+                    current_chunk_size += len(piece)
+                    view = view[len(piece):]
+
+                    if current_chunk_size == current_chunk_limit:
+                        await chunk_file.close()
+                        chunk_paths.append((chunk_path, len(chunk_paths)))
+                        chunk_file = None
                         current_chunk_size = 0
-                        chunk_path = os.path.join(user_path, f"chunk_{current_chunk_index}.part")
-                        f = await aiofiles.open(chunk_path, 'wb')
 
-            await check_file(file_hash=sha256.hexdigest(), file_size=total_size, original_file_size=file_size_bytes, original_file_hash=file_hash)
+            async def flush(data: bytearray):
+                # hashlib releases the GIL on large buffers, so hashing in a worker thread overlaps the chunk writes
+                # and does not block other requests served by the event loop.
+                await asyncio.gather(
+                    loop.run_in_executor(None, sha256.update, data),
+                    write_to_chunks(data)
+                )
+
+            # Received data is gathered in a buffer and written in large blocks, split into chunks of the sizes
+            # computed from the declared file size.
+            try:
+                loop = asyncio.get_running_loop()
+                buffer = bytearray()
+                async for data in file:
+                    total_size += len(data)
+                    buffer += data
+
+                    if len(buffer) >= WRITE_BUFFER_SIZE:
+                        await flush(buffer)
+                        buffer = bytearray()
+
+                await flush(buffer)
+            finally:
+                if chunk_file is not None:
+                    await chunk_file.close()
 
             if current_chunk_size > 0:
-                chunk_paths.append((chunk_path, current_chunk_index))
+                chunk_paths.append((chunk_path, len(chunk_paths)))
+
+            await check_file(file_hash=sha256.hexdigest(), file_size=total_size, original_file_size=file_size_bytes, original_file_hash=file_hash)
+
+            stored_chunks = [None] * (len(chunk_paths) * MIN_MINERS_REPLICATION_FOR_CHUNK)
+            stored_replicas = [0] * len(chunk_paths)
 
-            tasks = [asyncio.create_task(store_chunk_with_redundancy(chunk_path, chunk_index)) for chunk_path, chunk_index in chunk_paths]
-            await asyncio.gather(*tasks)
+            # If storing any chunk fails, the other chunks are cancelled before the stored ones are removed
+            await gather_or_cancel(*[store_chunk_with_redundancy(chunk_path, chunk_index) for chunk_path, chunk_index in chunk_paths])
 
-            if len(stored_chunks_results) != (current_chunk_index + 1) * MIN_MINERS_REPLICATION_FOR_CHUNK:
+            if not chunk_paths or any(replicas < MIN_MINERS_REPLICATION_FOR_CHUNK for replicas in stored_replicas):
                 raise RedundancyException
 
+            stored_chunks_results = [slot for slot in stored_chunks if slot]
+
         # A ChunkParam object is generated per chunk stored
-        for chunk_uuid, chunk_index, miner_ss58_address, file in stored_chunks_results:
+        for miner, chunk_uuid, chunk_index, _ in stored_chunks_results:
             chunks_params.append(ChunkParams(
                 uuid=chunk_uuid,
                 chunk_index=chunk_index,
-                miner_ss58_address=miner_ss58_address
+                miner_ss58_address=miner.ss58_address
             ))
 
         # A ValidationEvent object is generated for each chunk stored * each validator
-        for _ in range(validators_len):
-            validator_events_validations = []
-
-            for chunk_uuid, chunk_index, miner_ss58_address, chunk_path in stored_chunks_results:
-                with open(chunk_path, 'rb') as chunk:
-                    file_size = os.path.getsize(chunk_path)
-                    sub_chunk_start = random.randint(0, max(0, file_size - MAX_ENCODED_RANGE))
+        created_at = int(time.time() * 1000)
+        # Each chunk file is opened once and a sub chunk is drawn from it for every validator
+        events_per_validator: List[List[ValidationEvent]] = [[] for _ in range(validators_len)]
+        sub_chunk_buffer = memoryview(bytearray(MAX_ENCODED_RANGE))
+        for miner, chunk_uuid, chunk_index, chunk_path in stored_chunks_results:
+            with open(chunk_path, 'rb') as chunk:
+                file_size = os.fstat(chunk.fileno()).st_size
+                max_sub_chunk_start = max(0, file_size - MAX_ENCODED_RANGE)
+
+                for validator_events_validations in events_per_validator:
+                    sub_chunk_start = random.randrange(max_sub_chunk_start + 1)
                     sub_chunk_end = min(sub_chunk_start + MAX_ENCODED_RANGE, file_size)
 
+                    # Read into a reusable buffer and encode it directly, without an intermediate bytes object
                     chunk.seek(sub_chunk_start)
-                    sub_chunk = chunk.read(sub_chunk_end - sub_chunk_start)
-                    sub_chunk_encoded = sub_chunk.hex()
+                    read_bytes = chunk.readinto(sub_chunk_buffer[:sub_chunk_end - sub_chunk_start])
+                    sub_chunk_encoded = sub_chunk_buffer[:read_bytes].hex()
 
                     validation_event = ValidationEvent(
                         uuid=chunk_uuid,
-                        miner_ss58_address=miner_ss58_address,
+                        miner_ss58_address=miner.ss58_address,
                         sub_chunk_start=sub_chunk_start,
                         sub_chunk_end=sub_chunk_end,
                         sub_chunk_encoded=sub_chunk_encoded,
-                        file_uuid=f"{int(time.time())}_{str(uuid.uuid4())}" if validating else file_uuid,
+                        file_uuid=f"{now}_{str(uuid.uuid4())}" if validating else file_uuid,
                         user_owner_ss58_address=user_ss58_address
                     )
 
                     if validating:
                         validation_event.expiration_ms = get_file_expiration()
-                        validation_event.created_at = int(time.time() * 1000)
+                        validation_event.created_at = created_at
 
                     validator_events_validations.append(validation_event)
 
-            if validator_events_validations:
-                validations_events_per_validator.append(validator_events_validations)
+        validations_events_per_validator.extend(events for events in events_per_validator if events)
 
         # When converting the TCP StoreEvent message to its object, the chunk parameters are being sorted by their UUID.
         # To ensure the parameter signatures match, we sorted them beforehand.
@@ -453,7 +567,66 @@ async def store_new_file(
             shutil.rmtree(user_path)
 
 
-async def _store_request(keypair: Keypair, miner: ModuleInfo, user_ss58_address: Ss58Address, chunk_path: str) -> Optional[MinerWithChunk]:
+def _record_store_latency(miner_ss58_address: str, latency: float):
+    """
+    Updates the store latency average of a miner with a new observation.
+
+    Params:
+        miner_ss58_address (str): The SS58 address of the miner.
+        latency (float): The observed latency in seconds. Failed requests count as a timeout.
+    """
+    previous_latency = _miner_store_latencies.get(miner_ss58_address)
+    if previous_latency is None:
+        _miner_store_latencies[miner_ss58_address] = latency
+    else:
+        _miner_store_latencies[miner_ss58_address] = previous_latency + MINER_LATENCY_EWMA_ALPHA * (latency - previous_latency)
+
+
+def _rank_miners(miners: List[ModuleInfo]) -> List[ModuleInfo]:
+    """
+    Orders miners by their store latency, the preferred miners being placed last.
+
+    The order is a weighted random sample where each miner's weight is inversely proportional to its average
+    latency, so faster miners tend to receive chunks first while the load is still spread across all of them.
+    Miners without observations are weighted as the average known miner.
+
+    Params:
+        miners (List[ModuleInfo]): The miners to rank.
+
+    Returns:
+        List[ModuleInfo]: The miners, the preferred ones at the end of the list.
+    """
+    known_latencies = [_miner_store_latencies[miner.ss58_address] for miner in miners if miner.ss58_address in _miner_store_latencies]
+    average_latency = max(sum(known_latencies) / len(known_latencies), 1e-3) if known_latencies else 1.0
+
+    def sample_key(miner: ModuleInfo) -> float:
+        relative_latency = max(_miner_store_latencies.get(miner.ss58_address, average_latency), 1e-3) / average_latency
+        return random.random() ** relative_latency
+
+    return sorted(miners, key=sample_key)
+
+
+def _get_chunk_sizes(file_size_bytes: Optional[int]) -> List[int]:
+    """
+    Splits a file size into the smallest number of chunks of at most MAX_CHUNK_SIZE bytes.
+
+    The remainder is distributed across the chunks, so their sizes differ by one byte at most.
+
+    Params:
+        file_size_bytes (Optional[int]): The file size in bytes.
+
+    Returns:
+        List[int]: The size of each chunk in bytes, empty if the file size is unknown or zero.
+    """
+    if not file_size_bytes or file_size_bytes <= 0:
+        return []
+
+    num_chunks = -(-file_size_bytes // MAX_CHUNK_SIZE)
+    chunk_size, remainder = divmod(file_size_bytes, num_chunks)
+    return [chunk_size + 1] * remainder + [chunk_size] * (num_chunks - remainder)
+
+
+async def _store_request(keypair: Keypair, miner: ModuleInfo, user_ss58_address: Ss58Address, chunk_path: str, session: Optional[ClientSession] = None) -> Optional[MinerWithChunk]:
     """
      Sends a request to a miner to store a file chunk.
 
@@ -466,6 +639,7 @@ async def _store_request(keypair: Keypair, miner: ModuleInfo, user_ss58_address:
          miner (ModuleInfo): The miner's module information containing connection details and SS58 address.
          user_ss58_address (Ss58Address): The SS58 address of the user associated with the file chunk.
          chunk_path (str): The chunk path.
+         session (ClientSession, optional): HTTP session to reuse connections from.
 
      Returns:
          Optional[MinerWithChunk]: An object containing a MinerWithChunk if the storage request is successful, otherwise None.
@@ -477,7 +651,8 @@ async def _store_request(keypair: Keypair, miner: ModuleInfo, user_ss58_address:
             'folder': user_ss58_address,
             'chunk': chunk_path
         },
-        timeout=MINER_STORE_TIMEOUT_SECONDS
+        timeout=MINER_STORE_TIMEOUT_SECONDS,
+        session=session
     )
 
     return MinerWithChunk(miner.ss58_address, miner_answer["id"]) if miner_answer else None
@@ -20,6 +20,9 @@
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 #  SOFTWARE.
 
+from typing import Optional
+
+from aiohttp import ClientSession
 from communex.types import Ss58Address
 from substrateinterface import Keypair
 
@@ -30,7 +33,7 @@ from smartdrive.validator.api.exceptions import StorageLimitException, FileTooLa
 from smartdrive.validator.database.database import Database
 
 
-async def remove_chunk_request(keypair: Keypair, user_ss58_address: Ss58Address, miner: ModuleInfo, chunk_uuid: str) -> bool:
+async def remove_chunk_request(keypair: Keypair, user_ss58_address: Ss58Address, miner: ModuleInfo, chunk_uuid: str, session: Optional[ClientSession] = None) -> bool:
     """
     Sends a request to a miner to remove a specific data chunk.
 
@@ -43,6 +46,7 @@ async def remove_chunk_request(keypair: Keypair, user_ss58_address: Ss58Address,
         user_ss58_address (Ss58Address): The SS58 address of the user associated with the data chunk.
         miner (ModuleInfo): The miner's module information.
         chunk_uuid (str): The UUID of the data chunk to be removed.
+        session (ClientSession, optional): HTTP session to reuse connections from.
 
     Returns:
         bool: Returns True if the miner confirms the removal request, otherwise False.
@@ -52,7 +56,8 @@ async def remove_chunk_request(keypair: Keypair, user_ss58_address: Ss58Address,
         {
             "folder": user_ss58_address,
             "chunk_uuid": chunk_uuid
-        }
+        },
+        session=session
     )
     return True if miner_answer else False
 
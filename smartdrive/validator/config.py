@@ -28,12 +28,13 @@ multiprocessing.set_start_method("fork")
 
 
 class Config:
-    def __init__(self, key: str, database_path: str, port: int, testnet: bool, netuid: int):
+    def __init__(self, key: str, database_path: str, port: int, testnet: bool, netuid: int, cpu_affinity: str = None):
         self.key: str = key
         self.database_path: str = database_path
         self.port: int = port
         self.testnet: bool = testnet
         self.netuid: int = netuid
+        self.cpu_affinity: str = cpu_affinity
         self.database_file: str = os.path.join(database_path, "smartdrive.db")
         self.database_export_file: str = os.path.join(database_path, "export.zip")
 
@@ -49,6 +50,7 @@ class ConfigManager:
         self.config.port = config.port
         self.config.testnet = config.testnet
         self.config.netuid = config.netuid
+        self.config.cpu_affinity = config.cpu_affinity
         self.config.database_file = config.database_file
         self.config.database_export_file = config.database_export_file
 
@@ -20,9 +20,11 @@
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 #  SOFTWARE.
 
+import asyncio
 import os
 import sqlite3
 import time
+from concurrent.futures import ThreadPoolExecutor
 from sqlite3 import Cursor
 from typing import List, Optional, Union
 
@@ -40,6 +42,7 @@ from communex.types import Ss58Address
 class Database:
     _database_file_path = None
     _database_export_file_path = None
+    _writer_executor: Optional[ThreadPoolExecutor] = None
 
     def __init__(self):
         """
@@ -47,7 +50,7 @@ class Database:
 
         This constructor initializes the database manager with the specified database file paths
         and creates the necessary tables in the database if they do not already exist. It also sets
-        the SQLite auto vacuum mode to FULL.
+        the SQLite auto vacuum mode to FULL and the journal mode to WAL.
 
         Raises:
             sqlite3.Error: If there is an error creating the database tables.
@@ -139,6 +142,13 @@ class Database:
                     self._delete_database()
                     raise
 
+        # WAL is persistent in the database file, so readers no longer block on the writer and commits are cheaper
+        connection = sqlite3.connect(self._database_file_path)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL;")
+        finally:
+            connection.close()
+
     def _database_exists(self) -> bool:
         """
         Checks if the database file exists.
@@ -161,6 +171,21 @@ class Database:
         if self._database_exists():
             os.remove(self._database_file_path)
 
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Opens a new connection to the database.
+
+        In WAL mode a commit only needs to sync on checkpoints with `synchronous=NORMAL`, the database stays
+        consistent and just the last transactions may be lost on a power failure, which are recovered by the
+        block sync.
+
+        Returns:
+            sqlite3.Connection: The new connection.
+        """
+        connection = sqlite3.connect(self._database_file_path)
+        connection.execute("PRAGMA synchronous=NORMAL;")
+        return connection
+
     def insert_file(self, cursor: Cursor, file: File, event_uuid: str):
         """
         Inserts a file and its associated chunks into the database.
@@ -180,11 +205,10 @@ class Database:
             VALUES (?, ?, ?, ?)
         ''', (file.file_uuid, file.user_owner_ss58address, file.total_chunks, file.file_size_bytes))
 
-        for chunk in file.chunks:
-            cursor.execute('''
-                INSERT INTO chunk (uuid, file_uuid, event_uuid, miner_ss58_address, chunk_index)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (chunk.chunk_uuid, file.file_uuid, event_uuid, chunk.miner_ss58_address, chunk.chunk_index))
+        cursor.executemany('''
+            INSERT INTO chunk (uuid, file_uuid, event_uuid, miner_ss58_address, chunk_index)
+            VALUES (?, ?, ?, ?, ?)
+        ''', ((chunk.chunk_uuid, file.file_uuid, event_uuid, chunk.miner_ss58_address, chunk.chunk_index) for chunk in file.chunks))
 
     def get_file(self, user_ss58_address: str, file_uuid: str) -> File | None:
         """
@@ -205,7 +229,7 @@ class Database:
         """
         connection = None
         try:
-            connection = sqlite3.connect(self._database_file_path)
+            connection = self._connect()
             cursor = connection.cursor()
             cursor.execute(
                 "SELECT uuid, user_ss58_address, total_chunks FROM file WHERE file.uuid = ? AND file.user_ss58_address = ? AND removed = 0 ",
@@ -243,7 +267,7 @@ class Database:
         """
         connection = None
         try:
-            connection = sqlite3.connect(self._database_file_path)
+            connection = self._connect()
             cursor = connection.cursor()
 
             # Obtener los archivos del usuario que no han sido eliminados
@@ -307,7 +331,7 @@ class Database:
         """
         connection = None
         try:
-            connection = sqlite3.connect(self._database_file_path)
+            connection = self._connect()
             cursor = connection.cursor()
             cursor.execute(
                 "SELECT DISTINCT user_ss58_address FROM file WHERE removed = 0"
@@ -337,7 +361,7 @@ class Database:
         """
         connection = None
         try:
-            connection = sqlite3.connect(self._database_file_path)
+            connection = self._connect()
             cursor = connection.cursor()
             if only_files:
                 cursor.execute(
@@ -422,7 +446,7 @@ class Database:
                 """
         connection = None
         try:
-            connection = sqlite3.connect(self._database_file_path)
+            connection = self._connect()
             cursor = connection.cursor()
             cursor.execute(query, (file_uuid, ))
             rows = cursor.fetchall()
@@ -457,7 +481,7 @@ class Database:
         validation_events: list[ValidationEvent] = []
         connection = None
         try:
-            connection = sqlite3.connect(self._database_file_path)
+            connection = self._connect()
             cursor = connection.cursor()
 
             query = """
@@ -514,7 +538,7 @@ class Database:
         """
         connection = None
         try:
-            connection = sqlite3.connect(self._database_file_path)
+            connection = self._connect()
             cursor = connection.cursor()
 
             query = """
@@ -555,7 +579,7 @@ class Database:
         """
         connection = None
         try:
-            connection = sqlite3.connect(self._database_file_path)
+            connection = self._connect()
             cursor = connection.cursor()
 
             query = """
@@ -592,7 +616,7 @@ class Database:
         validation_events: list[ValidationEvent] = []
         connection = None
         try:
-            connection = sqlite3.connect(self._database_file_path)
+            connection = self._connect()
             connection.row_factory = sqlite3.Row
             cursor = connection.cursor()
 
@@ -645,7 +669,7 @@ class Database:
         """
         if cursor is None:
             try:
-                with sqlite3.connect(self._database_file_path) as connection:
+                with self._connect() as connection:
                     cursor = connection.cursor()
                     cursor.execute("UPDATE file SET removed = 1 WHERE uuid = ?", (file_uuid,))
                     cursor.execute("DELETE FROM validation WHERE file_uuid = ?", (file_uuid,))
@@ -670,7 +694,7 @@ class Database:
         """
         connection = None
         try:
-            connection = sqlite3.connect(self._database_file_path)
+            connection = self._connect()
             cursor = connection.cursor()
             cursor.execute("SELECT id FROM block ORDER BY id DESC LIMIT 1")
             result = cursor.fetchone()
@@ -696,11 +720,11 @@ class Database:
 
         connection = None
         try:
-            connection = sqlite3.connect(self._database_file_path)
+            connection = self._connect()
             connection.row_factory = sqlite3.Row
             with connection:
                 cursor = connection.cursor()
-                connection.execute('BEGIN TRANSACTION')
+                connection.execute('BEGIN IMMEDIATE')
 
                 cursor.execute(
                     'INSERT INTO block (id, proposer_ss58_address, signed_block) VALUES (?, ?, ?)',
@@ -724,6 +748,18 @@ class Database:
             if connection:
                 connection.close()
 
+    async def create_block_async(self, block: Block) -> bool:
+        """
+        Creates a block in the database with its associated events without blocking the event loop.
+
+        Parameters:
+            block (Block): The block to be created in the database.
+
+        Returns:
+            bool: True if the block and its events are successfully created, False otherwise.
+        """
+        return await self._run_in_writer(self.create_block, block)
+
     def _process_event(self, cursor, event: Union[StoreEvent, RemoveEvent, StoreRequestEvent], block_id: int):
         """
         Processes an event and executes the necessary operations in the database.
@@ -807,7 +843,7 @@ class Database:
         """
         connection = None
         try:
-            connection = sqlite3.connect(self._database_file_path)
+            connection = self._connect()
             connection.row_factory = sqlite3.Row
             cursor = connection.cursor()
 
@@ -878,17 +914,19 @@ class Database:
         """
         connection = None
         try:
-            connection = sqlite3.connect(self._database_file_path)
+            connection = self._connect()
             connection.row_factory = sqlite3.Row
             with connection:
                 cursor = connection.cursor()
-                connection.execute('BEGIN TRANSACTION')
+                connection.execute('BEGIN IMMEDIATE')
 
-                for validation_event in validation_events:
-                    cursor.execute('''
-                        INSERT INTO validation (chunk_uuid, miner_ss58_address, sub_chunk_start, sub_chunk_end, sub_chunk_encoded, file_uuid, expiration_ms, created_at, user_ss58_address)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (validation_event.uuid, validation_event.miner_ss58_address, validation_event.sub_chunk_start, validation_event.sub_chunk_end, validation_event.sub_chunk_encoded, validation_event.file_uuid, validation_event.expiration_ms, validation_event.created_at, validation_event.user_owner_ss58_address))
+                cursor.executemany('''
+                    INSERT INTO validation (chunk_uuid, miner_ss58_address, sub_chunk_start, sub_chunk_end, sub_chunk_encoded, file_uuid, expiration_ms, created_at, user_ss58_address)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    (validation_event.uuid, validation_event.miner_ss58_address, validation_event.sub_chunk_start, validation_event.sub_chunk_end, validation_event.sub_chunk_encoded, validation_event.file_uuid, validation_event.expiration_ms, validation_event.created_at, validation_event.user_owner_ss58_address)
+                    for validation_event in validation_events
+                ))
 
                 connection.commit()
             return True
@@ -901,6 +939,25 @@ class Database:
             if connection:
                 connection.close()
 
+    async def insert_validation_events_async(self, validation_events: list[ValidationEvent]) -> bool:
+        """
+        Insert a list of validation events into the validation table without blocking the event loop.
+
+        Params:
+            validation_events (list[ValidationEvent]): A list of ValidationEvent objects to be inserted into the validation table.
+
+        Returns:
+            bool: True if the insertion is successful, False otherwise.
+        """
+        return await self._run_in_writer(self.insert_validation_events, validation_events)
+
+    async def _run_in_writer(self, function, *args):
+        # SQLite allows a single writer at a time, so the writes of this instance are queued in one thread instead of
+        # contending for the database lock, and the event loop keeps running while they commit.
+        if self._writer_executor is None:
+            self._writer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="database-writer")
+        return await asyncio.get_running_loop().run_in_executor(self._writer_executor, function, *args)
+
     def get_random_validation_events_without_expiration_per_miners(self, miners: list[ModuleInfo]) -> list[ValidationEvent] | None:
         """
         Retrieves only one random validation event per miner for the given registered miners from the database.
@@ -913,7 +970,7 @@ class Database:
         """
         connection = None
         try:
-            connection = sqlite3.connect(self._database_file_path)
+            connection = self._connect()
             connection.row_factory = sqlite3.Row
             cursor = connection.cursor()
 
@@ -29,11 +29,13 @@ from typing import Optional, List
 from communex.types import Ss58Address
 
 from smartdrive.commune.models import ModuleInfo
+from smartdrive.utils import wait_event
 from smartdrive.validator.node.connection.utils.lock_proxy_wrapper import LockProxyWrapper
 from smartdrive.validator.node.util.exceptions import ConnectionPoolMaxSizeReached
 
 # Warning: PING_INTERVAL_SECONDS should always be considerably less than INACTIVITY_TIMEOUT_SECONDS
 PING_INTERVAL_SECONDS = 5
+PING_INTERVAL_JITTER_SECONDS = 0.5
 INACTIVITY_TIMEOUT_SECONDS = 10
 
 
@@ -53,13 +55,13 @@ class ConnectionPool:
         self._connections: DictProxy[Ss58Address, Connection] = manager.dict()
         self._cache_size = cache_size
         self._lock: LockProxyWrapper = manager.Lock()
+        # Set while the pool holds at least one connection, so other processes can wait for one
+        self._has_connections = manager.Event()
 
+    # Reads do not take the lock, each one is a single call that the manager answers atomically with a copy of the
+    # current connections, while writes still hold the lock to serialize their read-modify-write updates.
     def get(self, identifier) -> Optional[Connection]:
-        with self._lock:
-            if identifier in self._connections:
-                return self._connections[identifier]
-
-        return None
+        return self._connections.get(identifier)
 
     def get_all(self) -> list[Connection]:
         # Ignore the warning, the values method is returning the values not a list[tuple[_KT, _VT]]
@@ -69,18 +71,27 @@ class ConnectionPool:
         return self._connections.keys()
 
     def get_actives(self, identifier) -> Optional[Connection]:
-        with self._lock:
-            current_time = time.monotonic()
-
-            connection = self._connections.get(identifier)
-            if connection and current_time - connection.ping <= INACTIVITY_TIMEOUT_SECONDS:
-                return connection
+        connection = self._connections.get(identifier)
+        if connection and time.monotonic() - connection.ping <= INACTIVITY_TIMEOUT_SECONDS:
+            return connection
 
         return None
 
     def get_modules(self) -> List[ModuleInfo]:
         return list(map(lambda connection: connection.module, self.get_all()))
 
+    async def wait_for_connection(self, timeout: float) -> bool:
+        """
+        Waits until the pool holds at least one connection.
+
+        Params:
+            timeout (float): Maximum number of seconds to wait.
+
+        Returns:
+            bool: True if there is a connection in the pool, False if the timeout expired first.
+        """
+        return await wait_event(self._has_connections, timeout)
+
     def update_or_append(self, identifier: Ss58Address, module_info: ModuleInfo, socket: SocketType):
         with self._lock:
             connection = Connection(module_info, socket, time.monotonic())
@@ -94,6 +105,8 @@ class ConnectionPool:
             else:
                 self._connections[identifier] = connection
 
+            self._has_connections.set()
+
     def update_ping(self, identifier):
         with self._lock:
             if identifier in self._connections:
@@ -104,7 +117,9 @@ class ConnectionPool:
                 self._connections[identifier] = connection
 
     def remove(self, identifier: Ss58Address) -> Optional[SocketType]:
-        connection = self._connections.pop(identifier, None)
+        with self._lock:
+            connection = self._connections.pop(identifier, None)
+            self._clear_if_empty()
         return connection.socket if connection else None
 
     def remove_multiple(self, identifiers: list[Ss58Address]) -> list[SocketType]:
@@ -114,6 +129,7 @@ class ConnectionPool:
                 connection = self._connections.pop(identifier, None)
                 if connection:
                     sockets.append(connection.socket)
+            self._clear_if_empty()
         return sockets
 
     def remove_inactive(self) -> list[SocketType]:
@@ -124,4 +140,10 @@ class ConnectionPool:
 
             for identifier in connections_to_remove:
                 del self._connections[identifier]
+            self._clear_if_empty()
             return sockets_to_remove
+
+    def _clear_if_empty(self):
+        # Must be called holding the lock, so no connection is added between the check and the clear
+        if not self._connections:
+            self._has_connections.clear()
@@ -23,18 +23,18 @@ import queue
 import threading
 from _socket import SocketType
 from multiprocessing import Value
+from multiprocessing.synchronize import Event
+from typing import Callable, Dict
 
-from communex.compat.key import classic_load_key
 from communex.types import Ss58Address
 from substrateinterface import Keypair
 
 import smartdrive
 import smartdrive.validator.node.connection.utils.utils
 from smartdrive.logging_config import logger
-from smartdrive.models.event import parse_event, MessageEvent, Action, ValidationEvent
+from smartdrive.models.event import parse_event, MessageEvent, Action, ValidationEvent, message_events_from_json
 from smartdrive.sign import verify_data_signature, sign_data
 from smartdrive.validator.api.middleware.api_middleware import get_ss58_address_from_public_key
-from smartdrive.validator.config import config_manager
 from smartdrive.validator.database.database import Database
 from smartdrive.models.block import BlockEvent, block_event_to_block, Block
 from smartdrive.validator.node.connection.connection_pool import ConnectionPool
@@ -45,6 +45,8 @@ from smartdrive.validator.node.util.message import MessageCode, Message, Message
 from smartdrive.validator.utils import prepare_sync_blocks
 from smartdrive.validator.node.connection.utils.utils import send_message, receive_msg
 
+_VALID_MESSAGE_CODES = frozenset(MessageCode)
+
 
 class Peer(threading.Thread):
     MAX_BLOCKS_SYNC = 500
@@ -58,19 +60,31 @@ class Peer(threading.Thread):
     _database: Database = None
     _message_queue: queue.Queue = None
     _initial_sync_completed: Value = None
+    _initial_sync_received: Event = None
     _running: bool = True
+    _message_handlers: Dict[MessageCode, Callable[[Message], None]] = None
 
-    def __init__(self, socket: SocketType, connection_identifier: Ss58Address, connection_pool: ConnectionPool, event_pool: EventPool, initial_sync_completed: Value):
+    def __init__(self, socket: SocketType, connection_identifier: Ss58Address, connection_pool: ConnectionPool, event_pool: EventPool, initial_sync_completed: Value, initial_sync_received: Event, keypair: Keypair, database: Database):
         threading.Thread.__init__(self)
         self._socket = socket
         self._connection_identifier = connection_identifier
         self._connection_pool = connection_pool
         self._event_pool = event_pool
         self._initial_sync_completed = initial_sync_completed
-        self._keypair = classic_load_key(config_manager.config.key)
-        self._database = Database()
+        self._initial_sync_received = initial_sync_received
+        self._keypair = keypair
+        self._database = database
         self._message_queue = queue.Queue()
         self._running = True
+        self._message_handlers = {
+            MessageCode.MESSAGE_CODE_BLOCK: self._process_message_block,
+            MessageCode.MESSAGE_CODE_EVENT: self._process_message_event,
+            MessageCode.MESSAGE_CODE_PING: self._process_message_ping,
+            MessageCode.MESSAGE_CODE_PONG: self._process_message_pong,
+            MessageCode.MESSAGE_CODE_SYNC: self._process_message_sync,
+            MessageCode.MESSAGE_CODE_SYNC_BLOCKS_RESPONSE: self._process_message_sync_blocks_response,
+            MessageCode.MESSAGE_CODE_VALIDATION_EVENTS: self._process_message_validation_events
+        }
         threading.Thread(target=self._consume_queue).start()
 
     def run(self):
@@ -80,7 +94,7 @@ class Peer(threading.Thread):
                 json_message = receive_msg(self._socket)
                 self._message_queue.put(json_message)
             except (ConnectionResetError, ConnectionAbortedError, ClientDisconnectedException):
-                logger.debug(f"Peer {self._connection_identifier} disconnected")
+                logger.debug("Peer %s disconnected", self._connection_identifier)
                 break
             except Exception:
                 logger.error(f"Unexpected error in connection {self._connection_identifier}", exc_info=True)
@@ -99,62 +113,59 @@ class Peer(threading.Thread):
         try:
             message = Message(**json_message)
 
-            if message.body.code not in set(MessageCode):
+            if message.body.code not in _VALID_MESSAGE_CODES:
                 raise MessageFormatException("Unknown message code")
 
             signature_hex = message.signature_hex
             public_key_hex = message.public_key_hex
             ss58_address = get_ss58_address_from_public_key(public_key_hex)
 
-            is_verified_signature = verify_data_signature(message.body.dict(), signature_hex, ss58_address)
+            # The body is verified as received, it has the same keys and order the sender signed, so there is no need
+            # to rebuild it from the model
+            is_verified_signature = verify_data_signature(json_message["body"], signature_hex, ss58_address)
             if not is_verified_signature:
                 raise InvalidSignatureException()
 
-            if message.body.code == MessageCode.MESSAGE_CODE_BLOCK:
-                self._process_message_block(message)
-
-            elif message.body.code == MessageCode.MESSAGE_CODE_EVENT:
-                message_event = MessageEvent.from_json(message.body.data["event"], Action(message.body.data["event_action"]))
-                event = parse_event(message_event)
-                try:
-                    self._event_pool.append(event)
-                except InvalidSignatureException:
-                    logger.error(f"Invalid signature in event {event}", exc_info=True)
-
-            elif message.body.code == MessageCode.MESSAGE_CODE_PING:
-                body = MessageBody(
-                    code=MessageCode.MESSAGE_CODE_PONG,
-                    data={"version": smartdrive.__version__}
-                )
-                body_sign = sign_data(body.dict(), self._keypair)
-                message = Message(
-                    body=body,
-                    signature_hex=body_sign.hex(),
-                    public_key_hex=self._keypair.public_key.hex()
-                )
-                send_message(self._socket, message)
-
-            elif message.body.code == MessageCode.MESSAGE_CODE_PONG:
-                self._connection_pool.update_ping(self._connection_identifier)
+            message_handler = self._message_handlers.get(message.body.code)
+            if message_handler:
+                message_handler(message)
 
-            elif message.body.code == MessageCode.MESSAGE_CODE_SYNC:
-                self._process_message_sync(message)
+        except Exception:
+            logger.error("Can not process an incoming message", exc_info=True)
 
-            elif message.body.code == MessageCode.MESSAGE_CODE_SYNC_BLOCKS_RESPONSE:
-                self._process_message_sync_blocks_response(message)
+    def _process_message_event(self, message: Message):
+        message_event = MessageEvent.from_json(message.body.data["event"], Action(message.body.data["event_action"]))
+        event = parse_event(message_event)
+        try:
+            self._event_pool.append(event)
+        except InvalidSignatureException:
+            logger.error(f"Invalid signature in event {event}", exc_info=True)
+
+    def _process_message_ping(self, message: Message):
+        body = MessageBody(
+            code=MessageCode.MESSAGE_CODE_PONG,
+            data={"version": smartdrive.__version__}
+        )
+        body_sign = sign_data(body.dict(), self._keypair)
+        message = Message(
+            body=body,
+            signature_hex=body_sign.hex(),
+            public_key_hex=self._keypair.public_key.hex()
+        )
+        send_message(self._socket, message)
 
-            elif message.body.code == MessageCode.MESSAGE_CODE_VALIDATION_EVENTS:
-                validation_events = [ValidationEvent(**validation_event) for validation_event in message.body.data["list"]]
-                if validation_events:
-                    self._database.insert_validation_events(validation_events=validation_events)
+    def _process_message_pong(self, message: Message):
+        self._connection_pool.update_ping(self._connection_identifier)
 
-        except Exception:
-            logger.error("Can not process an incoming message", exc_info=True)
+    def _process_message_validation_events(self, message: Message):
+        validation_events = [ValidationEvent(**validation_event) for validation_event in message.body.data["list"]]
+        if validation_events:
+            self._database.insert_validation_events(validation_events=validation_events)
 
     def _process_message_block(self, message: Message):
         block_event = BlockEvent(
             block_number=message.body.data["block_number"],
-            events=list(map(lambda event: MessageEvent.from_json(event["event"], Action(event["event_action"])), message.body.data["events"])),
+            events=message_events_from_json(message.body.data["events"]),
             signed_block=message.body.data["signed_block"],
             proposer_ss58_address=message.body.data["proposer_ss58_address"]
         )
@@ -163,7 +174,8 @@ class Peer(threading.Thread):
         try:
             check_block_integrity(
                 block=block,
-                database=self._database
+                database=self._database,
+                signed_events=[message_event["event"] for message_event in message.body.data["events"]]
             )
 
             local_block_number = self._database.get_last_block_number() or 0
@@ -195,7 +207,9 @@ class Peer(threading.Thread):
                         data={
                             "blocks": [block.dict() for block in blocks],
                             "start": segment_start,
-                            "end": segment_end
+                            "end": segment_end,
+                            "last": segment_end == end,
+                            "initial": bool(message.body.data.get("initial"))
                         }
                     )
                     body_sign = sign_data(body.dict(), self._keypair)
@@ -222,13 +236,14 @@ class Peer(threading.Thread):
 
     def _process_message_sync_blocks_response(self, message: Message):
         if message.body.data["blocks"]:
-            for block in message.body.data["blocks"]:
-                block = Block(**block)
+            for block_data in message.body.data["blocks"]:
+                block = Block(**block_data)
 
                 try:
                     check_block_integrity(
                         block=block,
-                        database=self._database
+                        database=self._database,
+                        signed_events=block_data["events"]
                     )
                     self._database.create_block(block)
                     self._event_pool.remove_multiple(block.events)
@@ -236,3 +251,8 @@ class Peer(threading.Thread):
                 except BlockIntegrityException as e:
                     logger.error(e, exc_info=True)
                     return
+
+        # The validator waiting for the initial sync can go on as soon as its last segment is stored, the syncs of
+        # missing blocks do not affect it
+        if message.body.data.get("initial") and message.body.data.get("last"):
+            self._initial_sync_received.set()
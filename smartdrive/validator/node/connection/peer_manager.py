@@ -22,10 +22,12 @@
 
 import asyncio
 import multiprocessing
+import random
 import socket
 import select
 import threading
 from multiprocessing import Value
+from multiprocessing.synchronize import Event
 from time import sleep
 
 from communex.compat.key import classic_load_key
@@ -35,18 +37,18 @@ import smartdrive.validator.node.connection.utils.utils
 from smartdrive.commune.models import ModuleInfo
 from smartdrive.logging_config import logger
 from smartdrive.commune.request import get_filtered_modules
-from smartdrive.sign import verify_data_signature, sign_data
+from smartdrive.sign import verify_data_signature
 from smartdrive.validator.api.middleware.api_middleware import get_ss58_address_from_public_key
 from smartdrive.validator.config import config_manager
+from smartdrive.validator.database.database import Database
 from smartdrive.validator.evaluation.evaluation import MAX_ALLOWED_UIDS
 from smartdrive.validator.models.models import ModuleType
 from smartdrive.validator.node.connection.peer import Peer
-from smartdrive.validator.node.connection.connection_pool import ConnectionPool, PING_INTERVAL_SECONDS
-from smartdrive.validator.node.connection.utils.utils import connect_to_peer
+from smartdrive.validator.node.connection.connection_pool import ConnectionPool, PING_INTERVAL_SECONDS, PING_INTERVAL_JITTER_SECONDS
+from smartdrive.validator.node.connection.utils.utils import connect_to_peer, configure_peer_socket, encode_signed_message, broadcast_frame
 from smartdrive.validator.node.event.event_pool import EventPool
 from smartdrive.validator.node.util.exceptions import ConnectionPoolMaxSizeReached
-from smartdrive.validator.node.util.message import MessageBody, Message, MessageCode
-from smartdrive.validator.node.connection.utils.utils import send_message
+from smartdrive.validator.node.util.message import MessageBody, MessageCode
 
 
 class PeerManager(multiprocessing.Process):
@@ -57,20 +59,32 @@ class PeerManager(multiprocessing.Process):
     _event_pool: EventPool = None
     _connection_pool: ConnectionPool = None
     _initial_sync_completed: Value = None
+    _initial_sync_received: Event = None
     _keypair: Keypair = None
+    _netuid: int = None
+    _database: Database = None
+    _loop: asyncio.AbstractEventLoop = None
 
-    def __init__(self, event_pool: EventPool, initial_sync_completed: Value, connection_pool: ConnectionPool):
+    def __init__(self, event_pool: EventPool, initial_sync_completed: Value, initial_sync_received: Event, connection_pool: ConnectionPool):
         multiprocessing.Process.__init__(self)
         self._event_pool = event_pool
         self._connection_pool = connection_pool
         self._initial_sync_completed = initial_sync_completed
+        self._initial_sync_received = initial_sync_received
         self._keypair = classic_load_key(config_manager.config.key)
+        self._netuid = config_manager.config.netuid
+        self._database = Database()
 
     def run(self):
         listening_socket = None
 
         try:
-            threading.Thread(target=self._discovery).start()
+            # A single event loop, running in its own thread, serves every coroutine of this process instead of
+            # creating and closing a new loop for each incoming connection.
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(target=self._loop.run_forever, daemon=True).start()
+
+            asyncio.run_coroutine_threadsafe(self._discovery(), self._loop)
             threading.Thread(target=self._periodically_ping_nodes).start()
 
             listening_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -80,6 +94,7 @@ class PeerManager(multiprocessing.Process):
 
             while True:
                 peer_socket, address = listening_socket.accept()
+                configure_peer_socket(peer_socket)
                 threading.Thread(target=self._handle_connection, args=(peer_socket, address,)).start()
 
         except Exception:
@@ -90,136 +105,119 @@ class PeerManager(multiprocessing.Process):
                 listening_socket.close()
 
     def _handle_connection(self, peer_socket, peer_address):
-        async def handle_connection():
-            validator_connection = None
-            try:
-                # Wait self.IDENTIFIER_TIMEOUT_SECONDS as maximum time to get the identifier message
-                ready = select.select([peer_socket], [], [], self.IDENTIFIER_TIMEOUT_SECONDS)
-                if not ready[0]:
-                    logger.debug(f"Timeout: No identification from {peer_address}")
-                    peer_socket.close()
-                    return
-
-                identification_message = smartdrive.validator.node.connection.utils.utils.receive_msg(peer_socket)
-
-                signature_hex = identification_message["signature_hex"]
-                public_key_hex = identification_message["public_key_hex"]
-                ss58_address = get_ss58_address_from_public_key(public_key_hex)
-
-                logger.debug(f"Identification message received {ss58_address}")
-
-                is_verified_signature = verify_data_signature(identification_message["body"], signature_hex, ss58_address)
-                if not is_verified_signature:
-                    logger.debug(f"Invalid signature for {ss58_address}")
-                    peer_socket.close()
-                    return
-
-                active_connection = self._connection_pool.get_actives(ss58_address)
-                if active_connection:
-                    logger.debug(f"Peer {ss58_address} is already active")
-                    peer_socket.close()
-                    return
-
-                validators = await get_filtered_modules(config_manager.config.netuid, ModuleType.VALIDATOR)
-                if not validators:
-                    logger.debug("No active validators found")
-                    peer_socket.close()
-                    return
-
-                validator_connection = next((validator for validator in validators if validator.ss58_address == ss58_address), None)
-                if not validator_connection:
-                    logger.info(f"Validator {ss58_address} is not valid")
-                    peer_socket.close()
-                    return
-
-                # TODO: review later
-                # Check that the connection related to the validator modules is the same as address
-                # if peer_address[0] != validator_connection.connection.ip:
-                #     logger.info(f"Validator {ss58_address} connected from wrong address {peer_address}")
-                #     peer_socket.close()
-                #     return
+        validator_connection = None
+        try:
+            # Wait self.IDENTIFIER_TIMEOUT_SECONDS as maximum time to get the identifier message
+            ready = select.select([peer_socket], [], [], self.IDENTIFIER_TIMEOUT_SECONDS)
+            if not ready[0]:
+                logger.debug("Timeout: No identification from %s", peer_address)
+                peer_socket.close()
+                return
 
-                try:
-                    self._connection_pool.update_or_append(validator_connection.ss58_address, validator_connection, peer_socket)
-                    Peer(peer_socket, ss58_address, self._connection_pool, self._event_pool, self._initial_sync_completed).start()
-                    logger.debug(f"Peer {ss58_address} connected from {peer_address}")
-                except ConnectionPoolMaxSizeReached:
-                    logger.debug(f"Connection pool full for {ss58_address}", exc_info=True)
-                    peer_socket.close()
+            identification_message = smartdrive.validator.node.connection.utils.utils.receive_msg(peer_socket)
 
-            except Exception:
-                logger.error("Error handling connection", exc_info=True)
+            signature_hex = identification_message["signature_hex"]
+            public_key_hex = identification_message["public_key_hex"]
+            ss58_address = get_ss58_address_from_public_key(public_key_hex)
 
-                if validator_connection:
-                    self._connection_pool.remove(validator_connection.ss58_address)
+            logger.debug("Identification message received %s", ss58_address)
 
-                if peer_socket:
-                    peer_socket.close()
+            is_verified_signature = verify_data_signature(identification_message["body"], signature_hex, ss58_address)
+            if not is_verified_signature:
+                logger.debug("Invalid signature for %s", ss58_address)
+                peer_socket.close()
+                return
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(handle_connection())
-        loop.close()
+            active_connection = self._connection_pool.get_actives(ss58_address)
+            if active_connection:
+                logger.debug("Peer %s is already active", ss58_address)
+                peer_socket.close()
+                return
+
+            validators = asyncio.run_coroutine_threadsafe(
+                get_filtered_modules(self._netuid, ModuleType.VALIDATOR),
+                self._loop
+            ).result()
+            if not validators:
+                logger.debug("No active validators found")
+                peer_socket.close()
+                return
 
-    def _discovery(self):
-        async def discovery():
-            while True:
-                try:
-                    validators = await get_filtered_modules(config_manager.config.netuid, ModuleType.VALIDATOR)
-                    validators_ss58_addresses = {validator.ss58_address for validator in validators}
-
-                    unregistered_validators_ss8_addresses = [ss58_address for ss58_address in self._connection_pool.get_identifiers() if ss58_address not in validators_ss58_addresses]
-                    removed_connections = self._connection_pool.remove_multiple(unregistered_validators_ss8_addresses)
-                    for removed_connection in removed_connections:
-                        removed_connection.close()
-
-                    connected_ss58_addresses = self._connection_pool.get_identifiers()
-                    new_registered_validators = [
-                        validator for validator in validators
-                        if validator.ss58_address not in connected_ss58_addresses and validator.ss58_address != self._keypair.ss58_address
-                    ]
-                    for validator in new_registered_validators:
-                        threading.Thread(target=self._connect_to_peer, args=(validator,)).start()
+            validator_connection = next((validator for validator in validators if validator.ss58_address == ss58_address), None)
+            if not validator_connection:
+                logger.info(f"Validator {ss58_address} is not valid")
+                peer_socket.close()
+                return
 
-                except Exception:
-                    logger.error("Error discovering new validators", exc_info=True)
+            # TODO: review later
+            # Check that the connection related to the validator modules is the same as address
+            # if peer_address[0] != validator_connection.connection.ip:
+            #     logger.info(f"Validator {ss58_address} connected from wrong address {peer_address}")
+            #     peer_socket.close()
+            #     return
 
-                finally:
-                    await asyncio.sleep(self.CONNECTION_PROCESS_TIMEOUT_SECONDS)
+            try:
+                self._connection_pool.update_or_append(validator_connection.ss58_address, validator_connection, peer_socket)
+                Peer(peer_socket, ss58_address, self._connection_pool, self._event_pool, self._initial_sync_completed, self._initial_sync_received, self._keypair, self._database).start()
+                logger.debug("Peer %s connected from %s", ss58_address, peer_address)
+            except ConnectionPoolMaxSizeReached:
+                logger.debug("Connection pool full for %s", ss58_address, exc_info=True)
+                peer_socket.close()
 
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(discovery())
-        loop.close()
+        except Exception:
+            logger.error("Error handling connection", exc_info=True)
 
-    def _periodically_ping_nodes(self):
+            if validator_connection:
+                self._connection_pool.remove(validator_connection.ss58_address)
+
+            if peer_socket:
+                peer_socket.close()
+
+    async def _discovery(self):
         while True:
-            connections = self._connection_pool.get_all()
+            try:
+                validators = await get_filtered_modules(self._netuid, ModuleType.VALIDATOR)
+                validators_ss58_addresses = {validator.ss58_address for validator in validators}
+
+                unregistered_validators_ss8_addresses = [ss58_address for ss58_address in self._connection_pool.get_identifiers() if ss58_address not in validators_ss58_addresses]
+                removed_connections = self._connection_pool.remove_multiple(unregistered_validators_ss8_addresses)
+                for removed_connection in removed_connections:
+                    removed_connection.close()
+
+                connected_ss58_addresses = self._connection_pool.get_identifiers()
+                new_registered_validators = [
+                    validator for validator in validators
+                    if validator.ss58_address not in connected_ss58_addresses and validator.ss58_address != self._keypair.ss58_address
+                ]
+                for validator in new_registered_validators:
+                    threading.Thread(target=self._connect_to_peer, args=(validator,)).start()
 
-            for connection in connections:
-                try:
-                    body = MessageBody(
-                        code=MessageCode.MESSAGE_CODE_PING
-                    )
+            except Exception:
+                logger.error("Error discovering new validators", exc_info=True)
 
-                    body_sign = sign_data(body.dict(), self._keypair)
+            finally:
+                await asyncio.sleep(self.CONNECTION_PROCESS_TIMEOUT_SECONDS)
 
-                    message = Message(
-                        body=body,
-                        signature_hex=body_sign.hex(),
-                        public_key_hex=self._keypair.public_key.hex()
-                    )
+    def _periodically_ping_nodes(self):
+        while True:
+            connections = self._connection_pool.get_all()
 
-                    send_message(connection.socket, message)
+            if connections:
+                try:
+                    # The ping is the same for every peer, so it is signed once per round and the sends run
+                    # concurrently in the sending thread pool, a slow peer does not delay the pings to the others.
+                    ping_frame = encode_signed_message(MessageBody(code=MessageCode.MESSAGE_CODE_PING), self._keypair)
+                    broadcast_frame([connection.socket for connection in connections], ping_frame)
 
                 except Exception:
-                    logger.debug("Error pinging node")
+                    logger.debug("Error pinging nodes")
 
             inactive_connections = self._connection_pool.remove_inactive()
             for inactive_connection in inactive_connections:
                 inactive_connection.close()
 
-            sleep(PING_INTERVAL_SECONDS)
+            # The jitter keeps the validators from pinging each other at the same time
+            sleep(PING_INTERVAL_SECONDS + random.uniform(-PING_INTERVAL_JITTER_SECONDS, PING_INTERVAL_JITTER_SECONDS))
 
     def _connect_to_peer(self, validator: ModuleInfo):
         peer_socket = None
@@ -227,11 +225,11 @@ class PeerManager(multiprocessing.Process):
         try:
             peer_socket = connect_to_peer(self._keypair, validator)
             self._connection_pool.update_or_append(validator.ss58_address, validator, peer_socket)
-            Peer(peer_socket, validator.ss58_address, self._connection_pool, self._event_pool, self._initial_sync_completed).start()
-            logger.debug(f"Peer {validator.ss58_address} connected and added to the pool")
+            Peer(peer_socket, validator.ss58_address, self._connection_pool, self._event_pool, self._initial_sync_completed, self._initial_sync_received, self._keypair, self._database).start()
+            logger.debug("Peer %s connected and added to the pool", validator.ss58_address)
 
         except Exception:
-            logger.debug(f"Error connecting to peer {validator.ss58_address}")
+            logger.debug("Error connecting to peer %s", validator.ss58_address)
 
             self._connection_pool.remove(validator.ss58_address)
 
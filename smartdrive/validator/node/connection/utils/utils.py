@@ -21,11 +21,13 @@
 #  SOFTWARE.
 
 import json
+import os
 import select
 import socket
 import struct
-import threading
 from _socket import SocketType
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
 from substrateinterface import Keypair
 
@@ -36,10 +38,55 @@ from smartdrive.validator.node.util.exceptions import ClientDisconnectedExceptio
 from smartdrive.validator.node.util.message import MessageBody, MessageCode, Message
 
 CONNECTION_TIMEOUT_SECONDS = 5
+MAX_SENDING_THREADS = 16
+
+_HEADER = struct.Struct('!I')
+
+_send_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _reset_send_executor():
+    global _send_executor
+    _send_executor = None
+
+
+# Worker threads do not survive a fork, the child process creates its own executor when it needs it
+os.register_at_fork(after_in_child=_reset_send_executor)
+
+
+def _get_send_executor() -> ThreadPoolExecutor:
+    global _send_executor
+    if _send_executor is None:
+        _send_executor = ThreadPoolExecutor(max_workers=MAX_SENDING_THREADS, thread_name_prefix="send-message")
+    return _send_executor
+
+
+def configure_peer_socket(peer_socket: SocketType):
+    """
+    Configures a validator-to-validator socket for low latency.
+
+    Messages between validators are small and latency sensitive, so Nagle's algorithm is disabled. On Linux, delayed
+    acknowledgements are disabled as well.
+
+    Params:
+        peer_socket (SocketType): The connected socket.
+    """
+    peer_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    _set_quickack(peer_socket)
+
+
+def _set_quickack(peer_socket: SocketType):
+    # TCP_QUICKACK only exists on Linux and the kernel resets it, so it is set again after every received message
+    if hasattr(socket, "TCP_QUICKACK"):
+        try:
+            peer_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        except OSError:
+            pass
 
 
 def connect_to_peer(keypair: Keypair, module_info: ModuleInfo) -> SocketType:
     peer_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    configure_peer_socket(peer_socket)
 
     peer_socket.settimeout(CONNECTION_TIMEOUT_SECONDS)
     peer_socket.connect((module_info.connection.ip, module_info.connection.port + 1))
@@ -66,34 +113,96 @@ def connect_to_peer(keypair: Keypair, module_info: ModuleInfo) -> SocketType:
 
 
 def send_message(socket: SocketType, message: Message):
-    threading.Thread(target=_send_json, args=(socket, message.dict(),)).start()
+    _get_send_executor().submit(_send_json, socket, message.dict())
+
+
+def broadcast_message(sockets: List[SocketType], message: Message):
+    """
+    Sends the same message to several peers, serializing it only once.
+
+    Each send runs in the sending thread pool, so a slow peer does not delay the others.
+
+    Params:
+        sockets (List[SocketType]): The sockets of the peers.
+        message (Message): The message to send.
+    """
+    if sockets:
+        broadcast_frame(sockets, _encode_frame(message.dict()))
+
+
+def broadcast_frame(sockets: List[SocketType], frame: bytes):
+    """
+    Sends an already encoded frame to several peers.
+
+    Params:
+        sockets (List[SocketType]): The sockets of the peers.
+        frame (bytes): The frame to send, as returned by `encode_signed_message`.
+    """
+    executor = _get_send_executor()
+    for sock in sockets:
+        executor.submit(_send_frame, sock, frame)
+
+
+def encode_signed_message(body: MessageBody, keypair: Keypair) -> bytes:
+    """
+    Signs a message body and encodes the whole message as a frame ready to be sent.
+
+    The body is serialized once and the same bytes are both signed and embedded in the frame. The result is the
+    same as encoding the `Message` built with the body signature.
+
+    Params:
+        body (MessageBody): The body of the message.
+        keypair (Keypair): The keypair used to sign the body.
+
+    Returns:
+        bytes: The length-prefixed frame of the message.
+    """
+    body_bytes = json.dumps(body.dict()).encode('utf-8')
+    body_sign = sign_data(body_bytes, keypair)
+
+    msg = b"".join((
+        b'{"body": ', body_bytes,
+        b', "signature_hex": "', body_sign.hex().encode('ascii'),
+        b'", "public_key_hex": "', keypair.public_key.hex().encode('ascii'),
+        b'"}'
+    ))
+    return _HEADER.pack(len(msg)) + msg
 
 
 def receive_msg(sock):
-    msg_hdr = _recv_all(sock, 4)
+    msg_hdr = _recv_all(sock, _HEADER.size)
     if len(msg_hdr) == 0:
         raise ClientDisconnectedException('Client disconnected')
-    elif len(msg_hdr) < 4:
+    elif len(msg_hdr) < _HEADER.size:
         raise MessageException('Invalid header (< 4)')
 
-    msg_len = struct.unpack('!I', msg_hdr)[0]
+    msg_len = _HEADER.unpack_from(msg_hdr)[0]
 
     data = _recv_all(sock, msg_len)
+    _set_quickack(sock)
 
-    obj = json.loads(data.decode('utf-8'))
+    obj = json.loads(data)
 
     return obj
 
 
+def _encode_frame(obj: dict) -> bytes:
+    msg = json.dumps(obj).encode('utf-8')
+    return _HEADER.pack(len(msg)) + msg
+
+
 def _send_json(sock: SocketType, obj: dict):
     try:
-        msg = json.dumps(obj).encode('utf-8')
-        msg_len = len(msg)
-        packed_len = struct.pack('!I', msg_len)
+        _send_frame(sock, _encode_frame(obj))
+    except Exception:
+        logger.debug("Error sending json", exc_info=True)
 
+
+def _send_frame(sock: SocketType, frame: bytes):
+    try:
         _, ready_to_write, _ = select.select([], [sock], [], 5)
         if ready_to_write:
-            sock.sendall(packed_len + msg)
+            sock.sendall(frame)
         else:
             raise TimeoutError("Socket send info time out")
 
@@ -106,10 +215,13 @@ def _send_json(sock: SocketType, obj: dict):
 
 def _recv_all(sock, length):
     """ Helper function to receive all data for a given length. """
-    data = bytearray()
-    while len(data) < length:
-        packet = sock.recv(length - len(data))
-        if not packet:
+    # The buffer is allocated once with the final size and filled in place, instead of growing it with every packet
+    data = bytearray(length)
+    view = memoryview(data)
+    received = 0
+    while received < length:
+        received_bytes = sock.recv_into(view[received:])
+        if not received_bytes:
             raise ClientDisconnectedException('Client disconnected')
-        data.extend(packet)
+        received += received_bytes
     return data
@@ -21,7 +21,7 @@
 #  SOFTWARE.
 
 from multiprocessing import Manager
-from multiprocessing.managers import ListProxy
+from multiprocessing.managers import DictProxy
 from typing import Union, List
 
 from smartdrive.models.event import RemoveEvent, StoreEvent
@@ -31,34 +31,34 @@ from smartdrive.validator.node.connection.utils.lock_proxy_wrapper import LockPr
 class EventPool:
 
     def __init__(self, manager: Manager):
-        self._events: ListProxy = manager.list()
+        # Events are indexed by their uuid, insertion order keeps them in arrival order
+        self._events: DictProxy = manager.dict()
         self._lock: LockProxyWrapper = manager.Lock()
 
-    def get_all(self) -> ListProxy:
-        return self._events
+    def get_all(self) -> List[Union[StoreEvent, RemoveEvent]]:
+        return self._events.values()
 
     def append(self, event: Union[StoreEvent, RemoveEvent]):
         with self._lock:
-            if event.uuid not in list(map(lambda event: event.uuid, self._events)):
-                self._events.append(event)
+            if event.uuid not in self._events:
+                self._events[event.uuid] = event
 
     def append_multiple(self, events: List[Union[StoreEvent, RemoveEvent]]):
         with self._lock:
-            existing_uuids = set(map(lambda event: event.uuid, self._events))
+            existing_uuids = set(self._events.keys())
+            new_events = {}
             for event in events:
-                if event.uuid not in existing_uuids:
-                    self._events.append(event)
-                    existing_uuids.add(event.uuid)
+                if event.uuid not in existing_uuids and event.uuid not in new_events:
+                    new_events[event.uuid] = event
+            self._events.update(new_events)
 
     def remove_multiple(self, events: List[Union[StoreEvent, RemoveEvent]]):
         uuids_to_remove = {event.uuid for event in events}
         with self._lock:
-            updated_events = [event for event in self._events if event.uuid not in uuids_to_remove]
-            self._events[:] = updated_events
+            for uuid in uuids_to_remove:
+                self._events.pop(uuid, None)
 
     def consume_events(self, count: int) -> List[Union[StoreEvent, RemoveEvent]]:
-        items = []
         with self._lock:
-            for _ in range(min(count, len(self._events))):
-                items.append(self._events.pop(0))
-        return items
+            uuids = self._events.keys()[:count]
+            return [self._events.pop(uuid) for uuid in uuids]
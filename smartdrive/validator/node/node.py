@@ -22,6 +22,7 @@
 
 import multiprocessing
 from multiprocessing import Value
+from multiprocessing.synchronize import Event
 from typing import Union, List
 
 from communex.compat.key import classic_load_key
@@ -29,15 +30,14 @@ from substrateinterface import Keypair
 
 from smartdrive.commune.models import ModuleInfo
 from smartdrive.models.event import MessageEvent, StoreEvent, RemoveEvent, StoreRequestEvent
-from smartdrive.sign import sign_data
 from smartdrive.validator.config import config_manager
 from smartdrive.validator.database.database import Database
 from smartdrive.validator.node.connection.connection_pool import ConnectionPool, Connection
 from smartdrive.validator.node.connection.peer_manager import PeerManager
 from smartdrive.validator.node.event.event_pool import EventPool
 from smartdrive.validator.node.util.block_integrity import verify_event_signatures
-from smartdrive.validator.node.util.message import MessageCode, Message, MessageBody
-from smartdrive.validator.node.connection.utils.utils import send_message
+from smartdrive.validator.node.util.message import MessageCode, MessageBody
+from smartdrive.validator.node.connection.utils.utils import broadcast_frame, encode_signed_message
 
 
 class Node:
@@ -45,6 +45,7 @@ class Node:
     _event_pool: EventPool = None
     connection_pool: ConnectionPool = None
     initial_sync_completed: Value = None
+    initial_sync_received: Event = None
     _database: Database = None
 
     def __init__(self):
@@ -54,12 +55,14 @@ class Node:
         self._event_pool = EventPool(manager)
         self.connection_pool = ConnectionPool(manager=manager, cache_size=PeerManager.MAX_N_CONNECTIONS)
         self.initial_sync_completed = Value('b', False)
+        self.initial_sync_received = multiprocessing.Event()
         self._database = Database()
 
         connection_manager = PeerManager(
             event_pool=self._event_pool,
             connection_pool=self.connection_pool,
-            initial_sync_completed=self.initial_sync_completed
+            initial_sync_completed=self.initial_sync_completed,
+            initial_sync_received=self.initial_sync_received
         )
         connection_manager.daemon = True
         connection_manager.start()
@@ -86,23 +89,16 @@ class Node:
 
         message_event = MessageEvent.from_json(event.dict(), event.get_event_action())
 
-        connections = self.get_connections()
-        for index, connection in enumerate(connections):
-
-            body = MessageBody(
-                code=MessageCode.MESSAGE_CODE_EVENT,
-                data=message_event.dict()
-            )
-
-            body_sign = sign_data(body.dict(), self._keypair)
-
-            message = Message(
-                body=body,
-                signature_hex=body_sign.hex(),
-                public_key_hex=self._keypair.public_key.hex()
-            )
+        # The message is the same for every peer, so it is signed and serialized once
+        body = MessageBody(
+            code=MessageCode.MESSAGE_CODE_EVENT,
+            data=message_event.dict()
+        )
 
-            send_message(connection.socket, message)
+        connections = self.get_connections()
+        if connections:
+            frame = encode_signed_message(body, self._keypair)
+            broadcast_frame([connection.socket for connection in connections], frame)
 
     def consume_events(self, count: int) -> List[Union[StoreEvent, RemoveEvent]]:
         return self._event_pool.consume_events(count)
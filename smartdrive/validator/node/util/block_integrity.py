@@ -21,25 +21,41 @@
 #  SOFTWARE.
 
 import asyncio
-from typing import Union, List, Tuple
+import json
+from typing import Union, List, Tuple, Optional
 
 from smartdrive.commune.request import get_filtered_modules
 from smartdrive.models.block import Block
 from smartdrive.models.event import UserEvent, StoreEvent, RemoveEvent, StoreRequestEvent
 from smartdrive.sign import verify_data_signature
-from smartdrive.utils import get_stake_from_user, calculate_storage_capacity
+from smartdrive.utils import get_stake_from_user, calculate_storage_capacity, get_validator_addresses
 from smartdrive.validator.config import config_manager
 from smartdrive.validator.database.database import Database
 from smartdrive.validator.models.models import ModuleType
 from smartdrive.validator.node.util.exceptions import BlockIntegrityException, InvalidSignatureException, InvalidStorageRequestException
 
 
-def check_block_integrity(block: Block, database: Database):
+def check_block_integrity(block: Block, database: Database, signed_events: Optional[List[dict]] = None):
+    """
+    Verifies the events and the proposer signature of a block.
+
+    Parameters:
+        block (Block): The block to be verified.
+        database (Database): The database instance to operate on.
+        signed_events (Optional[List[dict]]): The events of the block as they were received, if available. The
+            proposer signature is verified over them instead of serializing the parsed events again.
+
+    Raises:
+        BlockIntegrityException: If any event is invalid or the block signature is not verified.
+    """
     if get_invalid_events(block.events, database):
         raise BlockIntegrityException(f"Invalid events in {block}")
 
+    if signed_events is None:
+        signed_events = [event.dict() for event in block.events]
+
     if not verify_data_signature(
-            data={"block_number": block.block_number, "events": [event.dict() for event in block.events]},
+            data={"block_number": block.block_number, "events": signed_events},
             signature_hex=block.signed_block,
             ss58_address=block.proposer_ss58_address
     ):
@@ -68,12 +84,13 @@ def get_invalid_events(events: List[Union[StoreEvent, RemoveEvent, StoreRequestE
 
         if storage_requests_users:
             validators = await get_filtered_modules(config_manager.config.netuid, ModuleType.VALIDATOR)
+            validator_addresses = get_validator_addresses(validators)
 
             total_stakes = {}
             for user_ss58_address in storage_requests_users:
                 total_stakes[user_ss58_address] = await get_stake_from_user(
                     user_ss58_address=user_ss58_address,
-                    validators=validators
+                    validator_addresses=validator_addresses
                 )
 
         for event in events:
@@ -116,11 +133,13 @@ def verify_event_signatures(event: Union[StoreEvent, RemoveEvent, StoreRequestEv
     """
     input_params_verified = True
     if isinstance(event, UserEvent):
-        input_params_verified = verify_data_signature(event.input_params.dict(), event.input_signed_params, event.user_ss58_address)
+        # Serialized once, as RemoveEvents may need to be verified against a second address
+        input_params = json.dumps(event.input_params.dict()).encode('utf-8')
+        input_params_verified = verify_data_signature(input_params, event.input_signed_params, event.user_ss58_address)
 
         # RemoveEvent created by validators (check_stake_task)
         if isinstance(event, RemoveEvent) and not input_params_verified:
-            input_params_verified = verify_data_signature(event.input_params.dict(), event.input_signed_params, event.validator_ss58_address)
+            input_params_verified = verify_data_signature(input_params, event.input_signed_params, event.validator_ss58_address)
 
     event_params_verified = verify_data_signature(event.event_params.dict(), event.event_signed_params, event.validator_ss58_address)
 
@@ -19,54 +19,101 @@
 #  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 #  SOFTWARE.
-import asyncio
-from typing import Tuple, List
+from typing import Tuple, List, Dict, Optional
 
 from substrateinterface import Keypair
 
 from smartdrive.commune.models import ModuleInfo
 from smartdrive.commune.request import get_filtered_modules
 from smartdrive.commune.utils import filter_truthful_validators
-from smartdrive.validator.config import config_manager
+from smartdrive.utils import async_ttl_cache
 from smartdrive.validator.constants import TRUTHFUL_STAKE_AMOUNT
 from smartdrive.validator.models.models import ModuleType
-from smartdrive.validator.node.connection.connection_pool import INACTIVITY_TIMEOUT_SECONDS as VALIDATOR_INACTIVITY_TIMEOUT_SECONDS
+from smartdrive.validator.node.connection.connection_pool import ConnectionPool, INACTIVITY_TIMEOUT_SECONDS as VALIDATOR_INACTIVITY_TIMEOUT_SECONDS
 
+MODULES_CACHE_TTL_SECONDS = 25
 
-async def get_proposer_validator(keypair: Keypair, connected_modules: List[ModuleInfo]) -> Tuple[bool, List[ModuleInfo], List[ModuleInfo]]:
+
+@async_ttl_cache(ttl=MODULES_CACHE_TTL_SECONDS)
+async def get_cached_filtered_modules(netuid: int, module_type: ModuleType) -> Tuple[ModuleInfo, ...]:
+    """
+    Retrieve a list of miners or validators, reusing the result of recent calls.
+
+    The registered modules rarely change between consecutive blocks or validations, so they are cached for
+    MODULES_CACHE_TTL_SECONDS. Failed requests are not cached. The cache belongs to the process running the event
+    loop of the validator and must not be shared with threads running their own loops.
+
+    Params:
+        netuid (int): Network identifier used for the queries.
+        module_type (ModuleType): ModuleType.MINER or ModuleType.VALIDATOR.
+
+    Returns:
+        Tuple[ModuleInfo, ...]: The `ModuleInfo` objects, shared by every caller.
+
+    Raises:
+        CommuneNetworkUnreachable: Raised if a valid result cannot be obtained from the network.
+    """
+    return tuple(await get_filtered_modules(netuid, module_type))
+
+
+@async_ttl_cache(ttl=MODULES_CACHE_TTL_SECONDS)
+async def _get_validators_index(netuid: int) -> Tuple[Tuple[ModuleInfo, ...], Dict[str, ModuleInfo], Optional[ModuleInfo]]:
+    """
+    Retrieve the validators of the network indexed by SS58 address, along with the one with the highest stake.
+
+    The index is built once per refresh of the validators, so each block only needs dictionary lookups.
+
+    Params:
+        netuid (int): Network identifier used for the queries.
+
+    Returns:
+        Tuple[Tuple[ModuleInfo, ...], Dict[str, ModuleInfo], Optional[ModuleInfo]]: All the validators, the
+        validators by SS58 address and the validator with the highest stake, or None if there are no validators.
+        They are shared by every caller and must not be modified.
+
+    Raises:
+        CommuneNetworkUnreachable: Raised if a valid result cannot be obtained from the network.
+    """
+    validators = tuple(await get_filtered_modules(netuid, ModuleType.VALIDATOR))
+    validators_by_ss58_address = {validator.ss58_address: validator for validator in validators}
+    top_stake_validator = max(validators, key=lambda v: v.stake or 0, default=None)
+    return validators, validators_by_ss58_address, top_stake_validator
+
+
+async def get_proposer_validator(keypair: Keypair, connection_pool: ConnectionPool, netuid: int) -> Tuple[bool, List[ModuleInfo], Tuple[ModuleInfo, ...]]:
     """
     Determines the proposer validator based on the validators' stake.
 
     Returns:
         is_current_validator_proposer (bool): True if the current validator is the proposer, False otherwise.
         active_validators (List[ModuleInfo]): List of currently active validators.
-        all_validators (List[ModuleInfo]): List of all validators in the network.
+        all_validators (Tuple[ModuleInfo, ...]): All the validators in the network.
     """
-    # Retrieving all active validators is crucial, so we attempt it an optimal number of times.
-    # Between each attempt, we wait VALIDATOR_INACTIVITY_TIMEOUT_SECONDS / 2,
-    # as new validators might be activated in the background.
-    active_validators = []
-    for _ in range(4):
-        active_validators = connected_modules
-        if active_validators:
-            break
-        await asyncio.sleep(VALIDATOR_INACTIVITY_TIMEOUT_SECONDS / 2)
+    # Retrieving all active validators is crucial. If there is none yet, we wait up to
+    # VALIDATOR_INACTIVITY_TIMEOUT_SECONDS * 2 for one, as new validators might be activated in the background.
+    active_validators = connection_pool.get_modules()
+    if not active_validators and await connection_pool.wait_for_connection(VALIDATOR_INACTIVITY_TIMEOUT_SECONDS * 2):
+        active_validators = connection_pool.get_modules()
 
     truthful_validators = filter_truthful_validators(active_validators)
 
     # Since the list of active validators never includes the current validator, we need to locate our own
     # validator within the complete list.
-    all_validators = await get_filtered_modules(config_manager.config.netuid, ModuleType.VALIDATOR)
-    own_validator = next((v for v in all_validators if v.ss58_address == keypair.ss58_address), None)
+    all_validators, validators_by_ss58_address, top_stake_validator = await _get_validators_index(netuid)
+    own_validator = validators_by_ss58_address.get(keypair.ss58_address)
 
     is_own_validator_truthful = own_validator and own_validator.stake >= TRUTHFUL_STAKE_AMOUNT
     if is_own_validator_truthful:
         truthful_validators.append(own_validator)
 
     if len(truthful_validators) == 0 and len(all_validators) == 0:
-        return False, active_validators, []
+        return False, active_validators, ()
 
-    proposer_validator = max(truthful_validators or all_validators, key=lambda v: v.stake or 0)
+    # Only the few truthful validators are compared, the top validator of the whole network is already known
+    if truthful_validators:
+        proposer_validator = max(truthful_validators, key=lambda v: v.stake or 0)
+    else:
+        proposer_validator = top_stake_validator
 
     is_current_validator_proposer = proposer_validator.ss58_address == keypair.ss58_address
 
@@ -21,7 +21,9 @@
 #  SOFTWARE.
 
 import asyncio
+import os
 import random
+from typing import Optional, Set
 
 from smartdrive.logging_config import logger
 from smartdrive.sign import sign_data
@@ -30,11 +32,11 @@ from smartdrive.validator.node.connection.utils.utils import send_message
 from smartdrive.validator.node.util.message import MessageCode, MessageBody, Message
 
 
-def prepare_sync_blocks(start, keypair, end=None, active_connections=None):
+def prepare_sync_blocks(start, keypair, end=None, active_connections=None, initial=False):
     async def _prepare_sync_blocks():
         if not active_connections:
             return
-        await get_synced_blocks(start, active_connections, keypair, end)
+        await get_synced_blocks(start, active_connections, keypair, end, initial)
 
     try:
         loop = asyncio.get_running_loop()
@@ -47,7 +49,7 @@ def prepare_sync_blocks(start, keypair, end=None, active_connections=None):
         asyncio.run(_prepare_sync_blocks())
 
 
-async def get_synced_blocks(start: int, connections: list[Connection], keypair, end: int = None):
+async def get_synced_blocks(start: int, connections: list[Connection], keypair, end: int = None, initial: bool = False):
     async def _get_synced_blocks(connection: Connection):
         try:
             body = MessageBody(
@@ -56,6 +58,9 @@ async def get_synced_blocks(start: int, connections: list[Connection], keypair,
             )
             if end:
                 body.data["end"] = str(end)
+            # Echoed in the responses, so only the initial sync wakes the validator waiting for it
+            if initial:
+                body.data["initial"] = True
 
             body_sign = sign_data(body.dict(), keypair)
 
@@ -83,3 +88,82 @@ def get_file_expiration() -> int:
     min_ms = 30 * 60 * 1000
     max_ms = 1 * 60 * 60 * 1000
     return random.randint(min_ms, max_ms)
+
+
+def set_cpu_affinity(cpu_affinity: str):
+    """
+    Restricts the validator process to the given CPUs.
+
+    With 'auto', the CPUs are those of the NUMA node the network interface of the default route is attached to, so
+    the event loops handle the sockets next to the interrupts of the interface instead of across NUMA nodes. Otherwise,
+    a list of CPUs and ranges like '0-3,8' is expected. The affinity is only supported on Linux, and any CPU set that
+    cannot be determined or applied leaves the process unchanged.
+
+    Params:
+        cpu_affinity (str): 'auto' or a comma-separated list of CPUs and CPU ranges.
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        logger.info("CPU affinity is not supported on this platform")
+        return
+
+    try:
+        cpus = _get_network_numa_cpus() if cpu_affinity == "auto" else _parse_cpu_list(cpu_affinity)
+    except ValueError:
+        logger.error(f"Invalid CPU affinity {cpu_affinity}")
+        return
+
+    # Only the CPUs the process is already allowed to use can be chosen
+    cpus = cpus & os.sched_getaffinity(0) if cpus else None
+    if not cpus:
+        logger.info("No CPUs found for the CPU affinity, running on all the available CPUs")
+        return
+
+    try:
+        os.sched_setaffinity(0, cpus)
+        logger.info(f"Running on CPUs {sorted(cpus)}")
+    except OSError:
+        logger.error("Error setting the CPU affinity", exc_info=True)
+
+
+def _get_network_numa_cpus() -> Optional[Set[int]]:
+    interface = _get_default_route_interface()
+    if not interface:
+        return None
+
+    try:
+        with open(f"/sys/class/net/{interface}/device/numa_node") as f:
+            numa_node = int(f.read())
+
+        # A negative node means the interface is not attached to any particular node
+        if numa_node < 0:
+            return None
+
+        with open(f"/sys/devices/system/node/node{numa_node}/cpulist") as f:
+            return _parse_cpu_list(f.read())
+
+    except (OSError, ValueError):
+        return None
+
+
+def _get_default_route_interface() -> Optional[str]:
+    try:
+        with open("/proc/net/route") as f:
+            for line in f.readlines()[1:]:
+                fields = line.split()
+                if len(fields) > 1 and fields[1] == "00000000":
+                    return fields[0]
+
+    except OSError:
+        pass
+
+    return None
+
+
+def _parse_cpu_list(cpu_list: str) -> Set[int]:
+    cpus = set()
+    for cpu_range in cpu_list.strip().split(","):
+        if not cpu_range:
+            continue
+        first, _, last = cpu_range.partition("-")
+        cpus.update(range(int(first), int(last or first) + 1))
+    return cpus
@@ -40,6 +40,8 @@ from smartdrive.validator.api.validate_api import validate_chunk_request
 from smartdrive.validator.database.database import Database
 from smartdrive.validator.evaluation.utils import generate_data
 
+MAX_SIMULTANEOUS_VALIDATION_REQUESTS = 64
+
 
 async def validate(miners: list[ModuleInfo], database: Database, key: Keypair) -> Optional[dict[int, bool]]:
     """
@@ -99,63 +101,70 @@ async def validate(miners: list[ModuleInfo], database: Database, key: Keypair) -
         miners_ss58_address_in_validation_events_not_expired
     )
 
-    # Remove expired validations
+    # Remove expired validations. The removal requests do not affect the rest of the process, so they run in the
+    # background while the new file is stored and the miners are validated.
+    remove_expired_validations_task = None
     if validation_events_expired:
         expired_events_to_remove = [
             event for event in validation_events_expired
             if event.miner_ss58_address in miners_with_expired_and_non_expired_validations or not miners_with_expired_and_non_expired_validations
         ]
-        await _remove_expired_validations(
+        remove_expired_validations_task = asyncio.create_task(_remove_expired_validations(
             validation_events_expired=expired_events_to_remove,
             miners=miners,
             database=database,
             keypair=key
-        )
-
-    # Handle creating new validation events if there are no conflicts with expired validations
-    miners_to_store = _determine_miners_to_store(validation_events_with_expiration, validation_events_expired, miners)
-    if miners_to_store and not miners_with_expired_and_non_expired_validations:
-        path = os.path.expanduser(DEFAULT_VALIDATOR_PATH)
-        os.makedirs(path, exist_ok=True)
-        validation_path = os.path.join(path, "validation.bin")
-        file_path = generate_data(size_mb=5, file_path=validation_path)
-        file_size = os.path.getsize(file_path)
-        file_hash = await calculate_hash(file_path)
-
-        input_params = {"file_hash": file_hash, "file_size_bytes": file_size}
-        input_signed_params = sign_data(input_params, key)
-        _, validations_events_per_validator = await store_new_file(
-            file=file_path,
-            miners=miners_to_store,
-            validator_keypair=key,
-            user_ss58_address=Ss58Address(key.ss58_address),
-            input_signed_params=input_signed_params.hex(),
-            file_size_bytes=file_size,
-            file_hash=file_hash,
-            validators_len=1  # To include current validator
-        )
-
-        if validations_events_per_validator:
-            current_validator_validation_events = validations_events_per_validator[0]
-            database.insert_validation_events(current_validator_validation_events)
-
-            # Check if there is no validation for each of the miners who stored the previously generated file. If there
-            # is no validation, insert the generated one.
-            for validation_event in current_validator_validation_events:
-                if validation_event.miner_ss58_address not in miners_ss58_address_in_validation_events_not_expired:
-                    miners_ss58_address_in_validation_events_not_expired.append(validation_event.miner_ss58_address)
-                    validation_events_not_expired.append(validation_event)
-
-    # Validate miners using the non-expired validations
-    result_miners = {}
-    if validation_events_not_expired:
-        result_miners = await _validate_miners(
-            validation_events_not_expired=validation_events_not_expired,
-            miners=miners,
-            keypair=key
-        )
+        ))
+
+    try:
+        # Handle creating new validation events if there are no conflicts with expired validations
+        miners_to_store = _determine_miners_to_store(validation_events_with_expiration, validation_events_expired, miners)
+        if miners_to_store and not miners_with_expired_and_non_expired_validations:
+            path = os.path.expanduser(DEFAULT_VALIDATOR_PATH)
+            os.makedirs(path, exist_ok=True)
+            validation_path = os.path.join(path, "validation.bin")
+            file_path = generate_data(size_mb=5, file_path=validation_path)
+            file_size = os.path.getsize(file_path)
+            file_hash = await calculate_hash(file_path)
+
+            input_params = {"file_hash": file_hash, "file_size_bytes": file_size}
+            input_signed_params = sign_data(input_params, key)
+            _, validations_events_per_validator = await store_new_file(
+                file=file_path,
+                miners=miners_to_store,
+                validator_keypair=key,
+                user_ss58_address=Ss58Address(key.ss58_address),
+                input_signed_params=input_signed_params.hex(),
+                file_size_bytes=file_size,
+                file_hash=file_hash,
+                validators_len=1  # To include current validator
+            )
 
-    return result_miners
+            if validations_events_per_validator:
+                current_validator_validation_events = validations_events_per_validator[0]
+                await database.insert_validation_events_async(current_validator_validation_events)
+
+                # Check if there is no validation for each of the miners who stored the previously generated file. If there
+                # is no validation, insert the generated one.
+                for validation_event in current_validator_validation_events:
+                    if validation_event.miner_ss58_address not in miners_ss58_address_in_validation_events_not_expired:
+                        miners_ss58_address_in_validation_events_not_expired.append(validation_event.miner_ss58_address)
+                        validation_events_not_expired.append(validation_event)
+
+        # Validate miners using the non-expired validations
+        result_miners = {}
+        if validation_events_not_expired:
+            result_miners = await _validate_miners(
+                validation_events_not_expired=validation_events_not_expired,
+                miners=miners,
+                keypair=key
+            )
+
+        return result_miners
+
+    finally:
+        if remove_expired_validations_task:
+            await remove_expired_validations_task
 
 
 async def _remove_expired_validations(validation_events_expired: List[ValidationEvent], miners: List[ModuleInfo], database: Database, keypair: Keypair):
@@ -167,10 +176,12 @@ async def _remove_expired_validations(validation_events_expired: List[Validation
         miners (List[ModuleInfo]): A list of ModuleInfo objects representing all the miners used in the validation process.
         keypair (Keypair): The keypair used to authorize and sign the removal requests.
     """
+    miners_by_ss58_address = {miner.ss58_address: miner for miner in miners}
+
     async def _remove_task(validation_event: ValidationEvent) -> Optional[bool]:
-        for miner in miners:
-            if miner.ss58_address == validation_event.miner_ss58_address:
-                return await remove_chunk_request(keypair, Ss58Address(validation_event.user_owner_ss58_address), miner, validation_event.uuid)
+        miner = miners_by_ss58_address.get(validation_event.miner_ss58_address)
+        if miner:
+            return await remove_chunk_request(keypair, Ss58Address(validation_event.user_owner_ss58_address), miner, validation_event.uuid)
         return None
 
     tasks = []
@@ -202,16 +213,19 @@ async def _validate_miners(validation_events_not_expired: list[ValidationEvent],
         CommuneNetworkUnreachable: Raised if a valid result cannot be obtained from the network.
     """
     result_miners: dict[int, bool] = {}
+    miners_by_ss58_address = {miner.ss58_address: miner for miner in miners}
+    semaphore = asyncio.Semaphore(MAX_SIMULTANEOUS_VALIDATION_REQUESTS)
 
     async def _validation_task(validation_event: ValidationEvent):
-        validation_event_miner_module_info = next((miner for miner in miners if miner.ss58_address == validation_event.miner_ss58_address), None)
+        validation_event_miner_module_info = miners_by_ss58_address.get(validation_event.miner_ss58_address)
         if validation_event_miner_module_info:
-            result = await validate_chunk_request(
-                keypair=keypair,
-                user_owner_ss58_address=Ss58Address(validation_event.user_owner_ss58_address),
-                miner_module_info=validation_event_miner_module_info,
-                validation_event=validation_event
-            )
+            async with semaphore:
+                result = await validate_chunk_request(
+                    keypair=keypair,
+                    user_owner_ss58_address=Ss58Address(validation_event.user_owner_ss58_address),
+                    miner_module_info=validation_event_miner_module_info,
+                    validation_event=validation_event
+                )
             result_miners[int(validation_event_miner_module_info.uid)] = result
 
     futures = [_validation_task(validation_event) for validation_event in validation_events_not_expired]
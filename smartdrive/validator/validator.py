@@ -26,6 +26,7 @@ import argparse
 import time
 import asyncio
 import uuid
+from typing import List, Set, Tuple, Union
 
 from communex.module.module import Module
 from communex.compat.key import classic_load_key
@@ -35,15 +36,15 @@ from substrateinterface import Keypair
 import smartdrive
 from smartdrive.commune.models import ConnectionInfo, ModuleInfo
 from smartdrive.logging_config import logger
-from smartdrive.models.block import Block, MAX_EVENTS_PER_BLOCK, block_to_block_event
-from smartdrive.models.event import RemoveEvent, EventParams, RemoveInputParams, StoreRequestEvent
+from smartdrive.models.block import Block, MAX_EVENTS_PER_BLOCK, block_to_block_event_dict
+from smartdrive.models.event import RemoveEvent, EventParams, RemoveInputParams, StoreRequestEvent, StoreEvent
 from smartdrive.models.utils import compile_miners_info_and_chunks
 from smartdrive.utils import DEFAULT_VALIDATOR_PATH, get_stake_from_user, calculate_storage_capacity, \
-    periodic_version_check
+    periodic_version_check, get_validator_addresses, gather_or_cancel, install_uvloop, wait_event
 from smartdrive.validator.api.utils import remove_chunk_request
 from smartdrive.validator.config import Config, config_manager
 from smartdrive.validator.database.database import Database
-from smartdrive.validator.node.connection.utils.utils import send_message
+from smartdrive.validator.node.connection.utils.utils import broadcast_frame, encode_signed_message
 from smartdrive.validator.node.node import Node
 from smartdrive.validator.api.api import API
 from smartdrive.validator.evaluation.evaluation import score_miners, set_weights
@@ -51,12 +52,12 @@ from smartdrive.validator.node.connection.connection_pool import INACTIVITY_TIME
 from smartdrive.validator.models.models import ModuleType
 from smartdrive.validator.node.util.block_integrity import get_invalid_events
 from smartdrive.validator.node.util.exceptions import InvalidSignatureException, InvalidStorageRequestException
-from smartdrive.validator.node.util.message import MessageBody, MessageCode, Message
-from smartdrive.validator.node.util.utils import get_proposer_validator
+from smartdrive.validator.node.util.message import MessageBody, MessageCode
+from smartdrive.validator.node.util.utils import get_proposer_validator, get_cached_filtered_modules
 from smartdrive.validator.validation import validate
-from smartdrive.validator.utils import prepare_sync_blocks
+from smartdrive.validator.utils import prepare_sync_blocks, set_cpu_affinity
 from smartdrive.sign import sign_data
-from smartdrive.commune.request import get_filtered_modules, get_modules
+from smartdrive.commune.request import get_modules
 
 
 def get_config() -> Config:
@@ -72,6 +73,7 @@ def get_config() -> Config:
     parser.add_argument("--database-path", default=DEFAULT_VALIDATOR_PATH, required=False, help="Path to the database.")
     parser.add_argument("--port", type=int, default=8001, required=False, help="Default remote API port.")
     parser.add_argument("--testnet", action='store_true', help="Use testnet or not.")
+    parser.add_argument("--cpu-affinity", default=None, required=False, help="CPUs to run on, 'auto' for the NUMA node of the network interface or a list like 0-3,8.")
 
     args = parser.parse_args()
     args.netuid = smartdrive.TESTNET_NETUID if args.testnet else smartdrive.NETUID
@@ -85,12 +87,30 @@ def get_config() -> Config:
         database_path=args.database_path,
         port=args.port,
         testnet=args.testnet,
-        netuid=args.netuid
+        netuid=args.netuid,
+        cpu_affinity=args.cpu_affinity
     )
 
     return _config
 
 
+def _seal_block(block_number: int, block_events: List[Union[StoreEvent, RemoveEvent, StoreRequestEvent]], keypair: Keypair) -> Tuple[bytes, List[dict]]:
+    """
+    Serializes the events of a new block and signs them.
+
+    Params:
+        block_number (int): The number of the new block.
+        block_events (List[Union[StoreEvent, RemoveEvent, StoreRequestEvent]]): The events included in the block.
+        keypair (Keypair): The keypair used to sign the block.
+
+    Returns:
+        Tuple[bytes, List[dict]]: The block signature and the serialized events it covers.
+    """
+    events = [event.dict() for event in block_events]
+    signed_block = sign_data({"block_number": block_number, "events": events}, keypair)
+    return signed_block, events
+
+
 class Validator(Module):
     BLOCK_INTERVAL_SECONDS = 30
     VALIDATION_VOTE_INTERVAL_SECONDS = 10 * 60  # 10 minutes
@@ -98,13 +118,18 @@ class Validator(Module):
 
     _config = None
     _key: Keypair = None
+    _netuid: int = None
     _database: Database = None
     api: API = None
     node: Node = None
+    _background_tasks: Set[asyncio.Task] = None
 
     def __init__(self):
         super().__init__()
+        self._background_tasks = set()
         self._key = classic_load_key(config_manager.config.key)
+        # The config lives in a manager process, so the values used on every step are read once
+        self._netuid = config_manager.config.netuid
         self._database = Database()
         self.node = Node()
         self.api = API(self.node)
@@ -125,7 +150,7 @@ class Validator(Module):
             try:
                 if start_step_time - last_validation_vote_time >= self.VALIDATION_VOTE_INTERVAL_SECONDS:
                     logger.info("Starting validation and voting task")
-                    asyncio.create_task(self.validate_vote_task())
+                    self._run_in_background(self.validate_vote_task())
                     last_validation_vote_time = start_step_time
             except Exception:
                 logger.error("Error validating and voting", exc_info=True)
@@ -133,29 +158,33 @@ class Validator(Module):
             try:
                 if start_step_time - last_check_stake_time >= self.SLEEP_TIME_CHECK_STAKE_SECONDS:
                     logger.info("Starting checking stake")
-                    asyncio.create_task(self.check_stake_task())
+                    self._run_in_background(self.check_stake_task())
                     last_check_stake_time = start_step_time
             except Exception:
                 logger.error("Error checking stake", exc_info=True)
 
             try:
-                is_current_validator_proposer, active_validators, all_validators = await get_proposer_validator(self._key, self.node.connection_pool.get_modules())
+                is_current_validator_proposer, active_validators, all_validators = await get_proposer_validator(self._key, self.node.connection_pool, self._netuid)
                 if is_current_validator_proposer:
+                    # The connections live in the peer manager process, so they are fetched once per block
+                    connections = self.node.get_connections()
                     new_block_number = (self._database.get_last_block_number() or 0) + 1
 
-                    # Trigger the initial sync and reiterate the loop after BLOCK_INTERVAL_SECONDS to verify if
-                    # initial_sync_completed has been set to True. This is needed since the response to the
+                    # Trigger the initial sync and reiterate the loop once the last synced blocks are stored, or after
+                    # BLOCK_INTERVAL_SECONDS if they do not arrive. This is needed since the response to the
                     # prepare_sync_blocks will be in the background via TCP.
                     # TODO: Improve initial sync
                     if not self.node.initial_sync_completed.value:
                         self.node.initial_sync_completed.value = True
                         if active_validators:
+                            self.node.initial_sync_received.clear()
                             prepare_sync_blocks(
                                 start=new_block_number,
-                                active_connections=self.node.get_connections(),
-                                keypair=self._key
+                                active_connections=connections,
+                                keypair=self._key,
+                                initial=True
                             )
-                            await asyncio.sleep(self.BLOCK_INTERVAL_SECONDS)
+                            await wait_event(self.node.initial_sync_received, self.BLOCK_INTERVAL_SECONDS)
                             continue
 
                     block_events = self.node.consume_events(count=MAX_EVENTS_PER_BLOCK)
@@ -165,40 +194,28 @@ class Validator(Module):
                         if isinstance(invalid_event, StoreRequestEvent) and isinstance(exception, InvalidStorageRequestException):
                             invalid_event.event_params.approved = False
 
-                    signed_block = sign_data({"block_number": new_block_number, "events": [event.dict() for event in block_events]}, self._key)
+                    # Serializing and signing the events is CPU bound, so it runs in a worker thread
+                    signed_block, block_events_dicts = await asyncio.get_running_loop().run_in_executor(None, _seal_block, new_block_number, block_events, self._key)
                     block = Block(
                         block_number=new_block_number,
                         events=block_events,
                         signed_block=signed_block.hex(),
                         proposer_ss58_address=Ss58Address(self._key.ss58_address)
                     )
-                    self._database.create_block(block)
+                    await self._database.create_block_async(block)
 
-                    block_event = block_to_block_event(block)
                     body = MessageBody(
                         code=MessageCode.MESSAGE_CODE_BLOCK,
-                        data=block_event.dict()
-                    )
-                    body_sign = sign_data(body.dict(), self._key)
-                    block_message = Message(
-                        body=body,
-                        signature_hex=body_sign.hex(),
-                        public_key_hex=self._key.public_key.hex()
+                        data=block_to_block_event_dict(block, block_events_dicts)
                     )
-                    for connection in self.node.get_connections():
-                        send_message(connection.socket, block_message)
-
-                    for event in block_events:
-                        if isinstance(event, RemoveEvent):
-                            # Only deletions are chosen, since as the block is processed before, the deletion is already marked for these events.
-                            chunks = self._database.get_chunks(file_uuid=event.event_params.file_uuid, only_not_removed=False)
-                            miners = await get_filtered_modules(config_manager.config.netuid, ModuleType.MINER)
-                            miners_info_with_chunk = compile_miners_info_and_chunks(miners, chunks)
+                    block_frame = encode_signed_message(body, self._key)
+                    broadcast_frame([connection.socket for connection in connections], block_frame)
 
-                            for miner in miners_info_with_chunk:
-                                connection = ConnectionInfo(miner["connection"]["ip"], miner["connection"]["port"])
-                                miner_info = ModuleInfo(miner["uid"], miner["ss58_address"], connection)
-                                await remove_chunk_request(self._key, event.user_ss58_address, miner_info, miner["chunk_uuid"])
+                    # The block is already stored and sent, so the chunks are removed from the miners in the background
+                    # instead of delaying the next block.
+                    remove_events = [event for event in block_events if isinstance(event, RemoveEvent)]
+                    if remove_events:
+                        self._run_in_background(self._remove_events_chunks(remove_events))
 
                 elapsed = time.monotonic() - start_step_time
                 sleep_time = max(0.0, self.BLOCK_INTERVAL_SECONDS - elapsed)
@@ -209,9 +226,46 @@ class Validator(Module):
                 logger.error("Error creating block", exc_info=True)
                 await asyncio.sleep(self.BLOCK_INTERVAL_SECONDS)
 
+    def _run_in_background(self, coroutine):
+        """
+        Schedules a coroutine as a task, keeping a reference to it until it is done so it is not garbage collected.
+
+        Params:
+            coroutine (Coroutine): The coroutine to run.
+        """
+        task = asyncio.create_task(coroutine)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _remove_events_chunks(self, remove_events: List[RemoveEvent]):
+        """
+        Removes from the miners the chunks of the files removed by the given events.
+
+        Params:
+            remove_events (List[RemoveEvent]): The remove events included in a block.
+        """
+        try:
+            miners = await get_cached_filtered_modules(self._netuid, ModuleType.MINER)
+
+            remove_requests = []
+            for event in remove_events:
+                # Only deletions are chosen, since as the block is processed before, the deletion is already marked for these events.
+                chunks = self._database.get_chunks(file_uuid=event.event_params.file_uuid, only_not_removed=False)
+                miners_info_with_chunk = compile_miners_info_and_chunks(miners, chunks)
+
+                for miner in miners_info_with_chunk:
+                    connection = ConnectionInfo(miner["connection"]["ip"], miner["connection"]["port"])
+                    miner_info = ModuleInfo(miner["uid"], miner["ss58_address"], connection)
+                    remove_requests.append(remove_chunk_request(self._key, event.user_ss58_address, miner_info, miner["chunk_uuid"]))
+
+            await asyncio.gather(*remove_requests, return_exceptions=True)
+
+        except Exception:
+            logger.error("Error removing chunks of removed files", exc_info=True)
+
     async def validate_vote_task(self):
         miners = [
-            miner for miner in await get_filtered_modules(config_manager.config.netuid, ModuleType.MINER)
+            miner for miner in await get_cached_filtered_modules(self._netuid, ModuleType.MINER)
             if miner.ss58_address != self._key.ss58_address
         ]
 
@@ -224,7 +278,7 @@ class Validator(Module):
         if result_miners:
             score_dict = score_miners(result_miners=result_miners)
             if score_dict:
-                await set_weights(score_dict, config_manager.config.netuid, self._key)
+                await set_weights(score_dict, self._netuid, self._key)
 
     async def check_stake_task(self):
         """
@@ -245,13 +299,14 @@ class Validator(Module):
             6. Continues to the next user and repeats the process.
             7. After processing all users, the function sleeps for the configured time before starting the process again.
         """
-        is_current_validator_proposer, _, validators = await get_proposer_validator(self._key, self.node.connection_pool.get_modules())
+        is_current_validator_proposer, _, validators = await get_proposer_validator(self._key, self.node.connection_pool, self._netuid)
 
         if is_current_validator_proposer:
             user_ss58_addresses = self._database.get_unique_user_ss58_addresses()
+            validator_addresses = get_validator_addresses(validators)
 
             for user_ss58_address in user_ss58_addresses:
-                total_stake = await get_stake_from_user(user_ss58_address=Ss58Address(user_ss58_address), validators=validators)
+                total_stake = await get_stake_from_user(user_ss58_address=Ss58Address(user_ss58_address), validator_addresses=validator_addresses)
                 total_size_stored_by_user = self._database.get_total_file_size_by_user(user_ss58_address=user_ss58_address, only_files=True)
                 available_storage_of_user = calculate_storage_capacity(total_stake)
 
@@ -312,15 +367,26 @@ if __name__ == "__main__":
         validator = Validator()
 
         async def run_tasks():
-            # Initial delay to allow active validators to load before request them
-            await asyncio.sleep(VALIDATOR_INACTIVITY_TIMEOUT_SECONDS)
+            # Initial delay to allow active validators to load before request them, it finishes as soon as the first
+            # one is connected
+            await validator.node.connection_pool.wait_for_connection(VALIDATOR_INACTIVITY_TIMEOUT_SECONDS)
 
-            await asyncio.gather(
-                periodic_version_check(),
-                validator.api.run_server(),
-                validator.run_steps()
-            )
+            # If any of them stops, the others are cancelled instead of being left running without it
+            try:
+                await gather_or_cancel(
+                    periodic_version_check(),
+                    validator.api.run_server(),
+                    validator.run_steps()
+                )
+            except Exception:
+                logger.error("Validator stopped", exc_info=True)
+                raise
 
         await run_tasks()
 
+    if config.cpu_affinity:
+        # Set before starting, so the API, the peer manager and every other child process inherit it
+        set_cpu_affinity(config.cpu_affinity)
+
+    install_uvloop()
     asyncio.run(main())